@@ -3,7 +3,9 @@
 __all__ = ["extras_require"]
 
 extras_require = {
+		"numpy": ["numpy>=1.17.0"],
+		"orjson": ["orjson>=3.0.0"],
 		"pprint": ["prettyprinter==0.18.0"],
 		"sphinx": ["sphinx<7,>=3.2.0", "sphinx-toolbox>=3.3.0"],
-		"all": ["prettyprinter==0.18.0", "sphinx<7,>=3.2.0", "sphinx-toolbox>=3.3.0"]
+		"all": ["numpy>=1.17.0", "orjson>=3.0.0", "prettyprinter==0.18.0", "sphinx<7,>=3.2.0", "sphinx-toolbox>=3.3.0"]
 		}
@@ -67,6 +67,7 @@ from typing import Type as TypingType
 
 # 3rd party
 from mypy.nodes import (  # nodep
+		ARG_NAMED_OPT,
 		ARG_OPT,
 		ARG_POS,
 		MDEF,
@@ -81,7 +82,17 @@ from mypy.nodes import (  # nodep
 from mypy.plugin import ClassDefContext, Plugin, SemanticAnalyzerPluginInterface  # nodep
 from mypy.plugins.common import add_method_to_class  # nodep
 from mypy.semanal_shared import set_callable_name  # nodep
-from mypy.types import AnyType, CallableType, Instance, Type, TypeOfAny, TypeType  # nodep
+from mypy.types import (  # nodep
+		AnyType,
+		CallableType,
+		Instance,
+		NoneType,
+		TupleType,
+		Type,
+		TypeOfAny,
+		TypeType,
+		UnionType
+		)
 from mypy.typevars import fill_typevars  # nodep
 from mypy.util import get_unique_redefinition_name  # nodep
 from mypy.version import __version__ as mypy_version  # nodep
@@ -127,12 +138,43 @@ def attr_utils_serialise_serde(cls_def_ctx: ClassDefContext) -> None:
 	node = new_type.node
 	decorated_class_instance = Instance(node, [])  # type: ignore[arg-type]
 
+	iterable = cls_def_ctx.api.lookup_fully_qualified_or_none("typing.Iterable")
+	assert iterable is not None
+	iterator = cls_def_ctx.api.lookup_fully_qualified_or_none("typing.Iterator")
+	assert iterator is not None
+
+	iterable_mapping_type = Instance(iterable.node, [mapping_str_any_type])  # type: ignore[arg-type]
+	iterable_class_type = Instance(iterable.node, [decorated_class_instance])  # type: ignore[arg-type]
+
+	optional_int_type = UnionType.make_union([cls_def_ctx.api.named_type(f"{_builtins}.int"), NoneType()])
+	tuple_any_type = cls_def_ctx.api.named_type(f"{_builtins}.tuple", [implicit_any])
+	list_any_type = cls_def_ctx.api.named_type(f"{_builtins}.list", [implicit_any])
+	sequence = cls_def_ctx.api.lookup_fully_qualified_or_none("typing.Sequence")
+	assert sequence is not None
+	columns_type = Instance(
+			mapping.node,  # type: ignore[arg-type]
+			[tuple_any_type, Instance(sequence.node, [implicit_any])],  # type: ignore[arg-type]
+			)
+
+	# Optional[Iterable[Union[str, Sequence[Any]]]]
+	selectors_type = UnionType.make_union([
+			Instance(
+					iterable.node,  # type: ignore[arg-type]
+					[UnionType.make_union([str_type, Instance(sequence.node, [implicit_any])])],  # type: ignore[arg-type]
+					),
+			NoneType(),
+			])
+
 	if "to_dict" not in info.names:
 		add_method_to_class(
 				api=cls_def_ctx.api,
 				cls=cls_def_ctx.cls,
 				name="to_dict",
-				args=[Argument(Var("convert_values", bool_type), bool_type, None, ARG_OPT)],
+				args=[
+						Argument(Var("convert_values", bool_type), bool_type, None, ARG_OPT),
+						Argument(Var("include", selectors_type), selectors_type, None, ARG_NAMED_OPT),
+						Argument(Var("exclude", selectors_type), selectors_type, None, ARG_NAMED_OPT),
+						],
 				return_type=mutable_mapping_str_any_type,
 				)
 
@@ -146,6 +188,208 @@ def attr_utils_serialise_serde(cls_def_ctx: ClassDefContext) -> None:
 				cls_type=TypeType(decorated_class_instance),
 				)
 
+	if "as_mapping" not in info.names:
+		add_method_to_class(
+				api=cls_def_ctx.api,
+				cls=cls_def_ctx.cls,
+				name="as_mapping",
+				args=[],
+				return_type=mapping_str_any_type,
+				)
+
+	if "update_from_dict" not in info.names:
+		add_method_to_class(
+				api=cls_def_ctx.api,
+				cls=cls_def_ctx.cls,
+				name="update_from_dict",
+				args=[Argument(Var('d', mapping_str_any_type), mapping_str_any_type, None, ARG_POS)],
+				return_type=decorated_class_instance,
+				)
+
+	if "to_dict_delta" not in info.names:
+		removed_paths_type = cls_def_ctx.api.named_type(f"{_builtins}.list", [tuple_any_type])
+		add_method_to_class(
+				api=cls_def_ctx.api,
+				cls=cls_def_ctx.cls,
+				name="to_dict_delta",
+				args=[
+						Argument(Var("previous", implicit_any), implicit_any, None, ARG_POS),
+						Argument(Var("convert_values", bool_type), bool_type, None, ARG_OPT),
+						],
+				return_type=TupleType([mutable_mapping_str_any_type, removed_paths_type], tuple_any_type),
+				)
+
+	if "to_json" not in info.names:
+		add_method_to_class(
+				api=cls_def_ctx.api,
+				cls=cls_def_ctx.cls,
+				name="to_json",
+				args=[],
+				return_type=str_type,
+				)
+
+	if "iter_json" not in info.names:
+		add_method_to_class(
+				api=cls_def_ctx.api,
+				cls=cls_def_ctx.cls,
+				name="iter_json",
+				args=[],
+				return_type=Instance(iterator.node, [str_type]),  # type: ignore[arg-type]
+				)
+
+	if "to_bytes" not in info.names:
+		add_method_to_class(
+				api=cls_def_ctx.api,
+				cls=cls_def_ctx.cls,
+				name="to_bytes",
+				args=[],
+				return_type=cls_def_ctx.api.named_type(f"{_builtins}.bytes"),
+				)
+
+	if "from_bytes" not in info.names:
+		add_classmethod_to_class(
+				api=cls_def_ctx.api,
+				cls=cls_def_ctx.cls,
+				name="from_bytes",
+				args=[Argument(Var("data", implicit_any), implicit_any, None, ARG_POS)],
+				return_type=decorated_class_instance,
+				cls_type=TypeType(decorated_class_instance),
+				)
+
+	if "from_dict_lazy" not in info.names:
+		add_classmethod_to_class(
+				api=cls_def_ctx.api,
+				cls=cls_def_ctx.cls,
+				name="from_dict_lazy",
+				args=[Argument(Var('d', mapping_str_any_type), mapping_str_any_type, None, ARG_POS)],
+				return_type=decorated_class_instance,
+				cls_type=TypeType(decorated_class_instance),
+				)
+
+	if "from_dict_unchecked" not in info.names:
+		add_classmethod_to_class(
+				api=cls_def_ctx.api,
+				cls=cls_def_ctx.cls,
+				name="from_dict_unchecked",
+				args=[Argument(Var('d', mapping_str_any_type), mapping_str_any_type, None, ARG_POS)],
+				return_type=decorated_class_instance,
+				cls_type=TypeType(decorated_class_instance),
+				)
+
+	# Union[str, bytes]
+	json_text_type = UnionType.make_union([str_type, cls_def_ctx.api.named_type(f"{_builtins}.bytes")])
+	iterable_json_text_type = Instance(iterable.node, [json_text_type])  # type: ignore[arg-type]
+
+	if "from_json" not in info.names:
+		add_classmethod_to_class(
+				api=cls_def_ctx.api,
+				cls=cls_def_ctx.cls,
+				name="from_json",
+				args=[Argument(Var("data", json_text_type), json_text_type, None, ARG_POS)],
+				return_type=decorated_class_instance,
+				cls_type=TypeType(decorated_class_instance),
+				)
+
+	if "from_jsons" not in info.names:
+		add_classmethod_to_class(
+				api=cls_def_ctx.api,
+				cls=cls_def_ctx.cls,
+				name="from_jsons",
+				args=[Argument(Var("documents", iterable_json_text_type), iterable_json_text_type, None, ARG_POS)],
+				return_type=cls_def_ctx.api.named_type(f"{_builtins}.list", [decorated_class_instance]),
+				cls_type=TypeType(decorated_class_instance),
+				)
+
+	if "from_dicts" not in info.names:
+		add_classmethod_to_class(
+				api=cls_def_ctx.api,
+				cls=cls_def_ctx.cls,
+				name="from_dicts",
+				args=[
+						Argument(Var("dicts", iterable_mapping_type), iterable_mapping_type, None, ARG_POS),
+						Argument(Var("workers", optional_int_type), optional_int_type, None, ARG_OPT),
+						Argument(Var("chunk_size", optional_int_type), optional_int_type, None, ARG_OPT),
+						],
+				return_type=cls_def_ctx.api.named_type(f"{_builtins}.list", [decorated_class_instance]),
+				cls_type=TypeType(decorated_class_instance),
+				)
+
+	if "iter_from_dicts" not in info.names:
+		add_classmethod_to_class(
+				api=cls_def_ctx.api,
+				cls=cls_def_ctx.cls,
+				name="iter_from_dicts",
+				args=[Argument(Var("dicts", iterable_mapping_type), iterable_mapping_type, None, ARG_POS)],
+				return_type=Instance(iterator.node, [decorated_class_instance]),  # type: ignore[arg-type]
+				cls_type=TypeType(decorated_class_instance),
+				)
+
+	if "to_dicts" not in info.names:
+		add_classmethod_to_class(
+				api=cls_def_ctx.api,
+				cls=cls_def_ctx.cls,
+				name="to_dicts",
+				args=[
+						Argument(Var("objs", iterable_class_type), iterable_class_type, None, ARG_POS),
+						Argument(Var("convert_values", bool_type), bool_type, None, ARG_OPT),
+						],
+				return_type=cls_def_ctx.api.named_type(f"{_builtins}.list", [mutable_mapping_str_any_type]),
+				cls_type=TypeType(decorated_class_instance),
+				)
+
+	if "iter_to_dicts" not in info.names:
+		add_classmethod_to_class(
+				api=cls_def_ctx.api,
+				cls=cls_def_ctx.cls,
+				name="iter_to_dicts",
+				args=[
+						Argument(Var("objs", iterable_class_type), iterable_class_type, None, ARG_POS),
+						Argument(Var("convert_values", bool_type), bool_type, None, ARG_OPT),
+						],
+				return_type=Instance(iterator.node, [mutable_mapping_str_any_type]),  # type: ignore[arg-type]
+				cls_type=TypeType(decorated_class_instance),
+				)
+
+	if "to_columns" not in info.names:
+		add_classmethod_to_class(
+				api=cls_def_ctx.api,
+				cls=cls_def_ctx.cls,
+				name="to_columns",
+				args=[Argument(Var("objs", iterable_class_type), iterable_class_type, None, ARG_POS)],
+				return_type=cls_def_ctx.api.named_type(f"{_builtins}.dict", [tuple_any_type, list_any_type]),
+				cls_type=TypeType(decorated_class_instance),
+				)
+
+	if "from_columns" not in info.names:
+		add_classmethod_to_class(
+				api=cls_def_ctx.api,
+				cls=cls_def_ctx.cls,
+				name="from_columns",
+				args=[Argument(Var("columns", columns_type), columns_type, None, ARG_POS)],
+				return_type=cls_def_ctx.api.named_type(f"{_builtins}.list", [decorated_class_instance]),
+				cls_type=TypeType(decorated_class_instance),
+				)
+
+	if "to_records" not in info.names:
+		add_classmethod_to_class(
+				api=cls_def_ctx.api,
+				cls=cls_def_ctx.cls,
+				name="to_records",
+				args=[Argument(Var("objs", iterable_class_type), iterable_class_type, None, ARG_POS)],
+				return_type=implicit_any,
+				cls_type=TypeType(decorated_class_instance),
+				)
+
+	if "from_records" not in info.names:
+		add_classmethod_to_class(
+				api=cls_def_ctx.api,
+				cls=cls_def_ctx.cls,
+				name="from_records",
+				args=[Argument(Var("array", implicit_any), implicit_any, None, ARG_POS)],
+				return_type=cls_def_ctx.api.named_type(f"{_builtins}.list", [decorated_class_instance]),
+				cls_type=TypeType(decorated_class_instance),
+				)
+
 
 #
 # def attr__make_attrs(cls_def_ctx: ClassDefContext):
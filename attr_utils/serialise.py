@@ -63,173 +63,4110 @@ API Reference
 #
 
 # stdlib
-from typing import TYPE_CHECKING, Any, Callable, Mapping, MutableMapping, Optional, Type, Union, overload
-
-try:
-	# 3rd party
-	from cytoolz import curried  # type: ignore[import-not-found]
-except ImportError:
-	from toolz import curried  # type: ignore[import-untyped]
+import asyncio
+import bz2
+import collections.abc
+import enum
+import gzip
+import hashlib
+import io
+import json
+import linecache
+import lzma
+import mmap
+import numbers
+import os
+import re
+import struct
+import sys
+import types
+from array import array
+from collections import OrderedDict, deque
+from concurrent.futures import FIRST_COMPLETED, Executor, Future, ProcessPoolExecutor, wait
+from functools import partial
+from itertools import chain, count, repeat
+from math import isfinite
+from operator import attrgetter
+from typing import (
+		IO,
+		TYPE_CHECKING,
+		Any,
+		AsyncIterable,
+		AsyncIterator,
+		Callable,
+		Deque,
+		Dict,
+		Iterable,
+		Iterator,
+		List,
+		Mapping,
+		MutableMapping,
+		Optional,
+		Sequence,
+		Set,
+		Tuple,
+		Type,
+		TypeVar,
+		Union,
+		cast,
+		get_type_hints,
+		overload
+		)
 
 # 3rd party
-from attrs import asdict, fields
+from attrs import NOTHING, Attribute, Factory, evolve, fields, setters
+from attrs.exceptions import FrozenAttributeError, FrozenInstanceError
+from attrs.validators import get_disabled
+from domdf_python_tools.typing import PathLike
+from typing_extensions import Literal, get_args, get_origin
 
-__all__ = ["serde"]
+__all__ = [
+		"serde",
+		"SerdeMapping",
+		"json_default",
+		"JSONBackend",
+		"set_json_backend",
+		"load_jsonl",
+		"dump_jsonl",
+		"load_jsonl_parallel",
+		"RecordFile",
+		"aload_jsonl",
+		"adump_jsonl",
+		]
+
+_C = TypeVar("_C")
 
 if TYPE_CHECKING:
+	# 3rd party
+	import numpy  # nodep
+
 	AttrsClass = Any
 else:
 	# this package
 	from attr_utils.utils import AttrsClass
 
+#: Sentinel for a value which must be computed by a ``takes_self`` factory.
+_MISSING = object()
 
-@overload
-def serde(
-		cls: Type,
-		from_key: str = ...,
-		to_key: str = ...,
-		) -> Type[AttrsClass]: ...
+#: Exceptions which indicate a path is missing from the dictionary passed to ``from_dict``.
+_LOOKUP_ERRORS = (KeyError, IndexError, TypeError)
 
+#: Types which are left unchanged by ``to_dict(convert_values=True)``.
+_SCALAR_TYPES = frozenset({str, int, float, bool, type(None), bytes})
 
-@overload
-def serde(
-		cls: None = None,
-		from_key: str = ...,
-		to_key: str = ...,
-		) -> Callable[[Type[AttrsClass]], Type[AttrsClass]]: ...
+#: Origins of ``Union`` types, including those written as ``X | Y``.
+_UNION_TYPES = frozenset({Union, getattr(types, "UnionType", Union)})
 
+#: Origins of generic types which are decoded into lists.
+_LIST_TYPES = frozenset({
+		list,
+		collections.abc.Sequence,
+		collections.abc.MutableSequence,
+		collections.abc.Collection,
+		collections.abc.Iterable,
+		})
 
-def serde(  # noqa: PRM003
-		cls: Optional[Type[AttrsClass]] = None,
-		from_key: str = "from",
-		to_key: str = "to",
-		) -> Union[Type[AttrsClass], Callable[[Type[AttrsClass]], Type[AttrsClass]]]:
-	r"""
-	Decorator to add serialisation and deserialisation capabilities to attrs classes.
+#: Origins of generic types which are decoded into sets.
+_SET_TYPES = frozenset({set, frozenset, collections.abc.Set, collections.abc.MutableSet})
 
-	The keys used in the dictionary output, and used when creating the class from a dictionary,
-	can be controlled using the ``metadata`` argument in :func:`attrs.field`:
+#: Origins of generic types which are decoded into dictionaries.
+_DICT_TYPES = frozenset({dict, collections.abc.Mapping, collections.abc.MutableMapping})
 
-	.. code-block::
+#: :mod:`struct` format codes for types which are stored in the fixed-size header of the binary encoding.
+_BINARY_SCALAR_CODES = {bool: '?', int: 'q', float: 'd'}
 
-		from attr_utils.serialize import serde
-		import attrs
+#: Types which are stored as raw bytes in the binary encoding, and decoded as a :class:`memoryview`.
+_BINARY_BYTES_TYPES = frozenset({bytes, bytearray, memoryview})
 
-		@serde
-		@attrs.define
-		class Person(object):
-			name = attrs.field(metadata={"to": name_path, "from": name_path})
-			phone = attrs.field(metadata={"to": phone_path, "from": phone_path})
+#: The number of distinct values stored for fields with ``metadata={"intern": True}``.
+_INTERN_TABLE_SIZE = 1024
 
-	The names of the keys given in the ``metadata`` argument can be controlled with the
-	``from_key`` and ``to_key`` arguments:
+#: The number of projections (``include`` and ``exclude`` arguments to ``to_dict``) cached for each class.
+_PROJECTION_CACHE_SIZE = 256
 
-	.. code-block::
+#: A field selector for ``to_dict``: an attribute name, or a prefix of the ``to`` path.
+_Selector = Union[str, Sequence[Any]]
 
-		from attr_utils.serialize import serde
-		import attrs
 
-		@serde(from_key="get", to_key="set")
-		@attrs.define
-		class Person(object):
-			name = attrs.field(metadata={"get": name_path, "set": name_path})
-			phone = attrs.field(metadata={"get": phone_path, "set": phone_path})
+class _PlanCache:
+	"""
+	Cache of compiled plans, keyed by class.
 
+	The plans are stored in an attribute of each class, rather than in a dictionary.
+	A plan refers to its class (as the generated functions construct it),
+	so an entry in a dictionary (even a :class:`weakref.WeakKeyDictionary`) would keep the class alive forever.
+	Instead the class and its plan form a reference cycle, which is collected along with the class
+	(e.g. when a module is reloaded and the class is redefined).
+	"""
 
-	This may be required when using other extensions to attrs.
+	#: The name of the attribute each class's plan is stored in.
+	attribute = "__attr_utils_serde_plan__"
 
+	def __getitem__(self, cls: Type) -> "_SerdePlan":
+		try:
+			return cls.__dict__[self.attribute]
+		except KeyError:
+			raise KeyError(cls) from None
 
-	:param cls: The attrs class to add the methods to.
-	:param from_key:
-	:param to_key:
+	def __setitem__(self, cls: Type, plan: "_SerdePlan") -> None:
+		setattr(cls, self.attribute, plan)
 
-	:rtype:
+	def __delitem__(self, cls: Type) -> None:
+		try:
+			delattr(cls, self.attribute)
+		except AttributeError:
+			raise KeyError(cls) from None
 
-	.. latex:vspace:: 20px
+	def __contains__(self, cls: Type) -> bool:
+		return self.attribute in cls.__dict__
 
-	Classes decorated with :deco:`~attr_utils.serialise.serde` will have two new methods added:
+	def invalidate_subclasses(self, cls: Type) -> None:
+		"""
+		Discard the plans of the undecorated subclasses of ``cls``, which were derived from its previous plan.
 
-	.. py:classmethod:: from_dict(d)
+		This is required if ``cls`` is decorated with :deco:`~.serde` again.
 
-		Construct an instance of the class from a dictionary.
+		:param cls:
+		"""
 
-		:param d: The dictionary.
-		:type d: :class:`~typing.Mapping`\[:class:`str`, :py:obj:`~typing.Any`\]
+		for subclass in cls.__subclasses__():
+			plan = subclass.__dict__.get(self.attribute)
+			if plan is not None and (plan.parent is not None or plan.cls is not subclass):
+				# Derived from the parent, or the lazy proxy class for the parent's plan.
+				del self[subclass]
+				self.invalidate_subclasses(subclass)
 
-	.. py:method:: to_dict(convert_values=False):
 
-		Returns a dictionary containing the contents of the class.
+_plans = _PlanCache()
 
-		:param convert_values: Recurse into other attrs classes, and convert tuples, sets etc.
-			into lists. This may be required to later construct a new class from the
-			dictionary if the class uses complex converter functions.
-		:type convert_values: :class:`bool`
 
-		:rtype: :class:`~typing.MutableMapping`\[:class:`str`, :py:obj:`~typing.Any`\]
+class _InternTable:
+	"""
+	A bounded table of strings, used to share a single copy of each distinct value of a low-cardinality field
+	between all the instances decoded by a plan.
 
-		.. versionchanged:: 0.5.0
+	Once the table is full, values which are not already in it are returned unchanged,
+	so a field with more distinct values than expected doesn't grow the table without limit.
 
-			By default values are left unchanged. In version 0.4.0 these were converted
-			to basic Python types, which may be undesirable. The original behaviour can be
-			restored using the ``convert_values`` parameter.
+	:param maxsize: The maximum number of distinct values to store.
+	"""
+
+	__slots__ = ("values", "maxsize")
+
+	def __init__(self, maxsize: int = _INTERN_TABLE_SIZE):
+		self.values: Dict[str, str] = {}
+		self.maxsize = maxsize
 
+	def __call__(self, value: Any) -> Any:
+		if type(value) is not str:
+			return value
+
+		try:
+			return self.values[value]
+		except KeyError:
+			if len(self.values) < self.maxsize:
+				self.values[value] = value
+			return value
+
+
+def _interned(table: _InternTable, decoder: Callable[[Any], Any], value: Any) -> Any:
+	return table(decoder(value))
+
+
+class _Index(int):
 	"""
+	A list index in a path given as a string, such as the ``0`` in ``"items[0].id"``.
 
-	def serde_with_class(cls: Type[AttrsClass]) -> Type[AttrsClass]:
+	A level of the ``to_dict`` layout whose keys are all indexes is output as a list rather than a dictionary.
+	"""
 
-		def from_dict(cls, d: Mapping[str, Any]):  # noqa: MAN002
-			from_fields = list(map(lambda a: (a, curried.get_in([from_key], a.metadata, [a.name])), fields(cls)))
+	__slots__ = ()
 
-			return cls(
-					**dict(map(
-							lambda f: (f[0].name, curried.get_in(f[1], d, f[0].default)),
-							from_fields,
-							)),
-					)
 
-		def to_dict(self, convert_values: bool = False) -> MutableMapping[str, Any]:
-			to_fields = curried.pipe(
-					fields(self.__class__),
-					curried.map(lambda a: (a, curried.get_in([to_key], a.metadata))),
-					curried.filter(lambda f: f[1]),
-					list,
-					)
+#: The syntax of paths given as strings.
+_PATH_SYNTAX = re.compile(r"(?:[^.\[\]]+|\[\d+\])(?:\.[^.\[\]]+|\[\d+\])*")
 
-			if convert_values:
-				d = asdict(self)
+#: The keys and list indexes of paths given as strings.
+_PATH_TOKEN = re.compile(r"(?P<key>[^.\[\]]+)|\[(?P<index>\d+)\]")
+
+
+def _parse_path(path: str) -> Tuple[Any, ...]:
+	"""
+	Parse a path given as a string, such as ``"contact.personal.name"`` or ``"items[0].id"``.
+
+	:param path:
+	"""
+
+	if not _PATH_SYNTAX.fullmatch(path):
+		raise ValueError(f"Invalid path {path!r}")
+
+	return tuple(
+			match["key"] if match["index"] is None else _Index(match["index"])
+			for match in _PATH_TOKEN.finditer(path)
+			)
+
+
+def _metadata_path(path: Any, attribute: Attribute) -> Tuple[Any, ...]:
+	"""
+	Returns the path given in the metadata of a field, which is either a string or a list of keys.
+
+	:param path:
+	:param attribute: The field, which is named in the error message if the path is invalid.
+	"""
+
+	if isinstance(path, str):
+		try:
+			path = _parse_path(path)
+		except ValueError as e:
+			raise ValueError(f"{e} for the {attribute.name!r} field.") from None
+
+	return _intern_path(path)
+
+
+def _intern_path(path: Iterable[Any]) -> Tuple[Any, ...]:
+	"""
+	Intern the string keys of the given path, so every plan shares a single copy of each key.
+
+	:param path:
+	"""
+
+	return tuple(sys.intern(key) if type(key) is str else key for key in path)
+
+
+class _FieldSpec:
+	"""
+	The serialisation information for a single attrs field, resolved once per class.
+
+	:param attribute:
+	:param from_key: The metadata key giving the path to read the value from.
+	:param to_key: The metadata key giving the path to write the value to.
+	"""
+
+	__slots__ = (
+			"attribute",
+			"name",
+			"init_name",
+			"from_path",
+			"to_path",
+			"converter",
+			"contextual_converter",
+			"intern_table",
+			)
+
+	def __init__(self, attribute: Attribute, from_key: str, to_key: str):
+		self.attribute = attribute
+		self.name: str = attribute.name
+
+		#: The name of the argument to ``__init__`` (differs from the name for private attributes).
+		self.init_name: str = getattr(attribute, "alias", None) or attribute.name.lstrip('_')
+
+		self.from_path: Tuple[Any, ...] = _metadata_path(attribute.metadata.get(from_key, [attribute.name]), attribute)
+
+		to_path = attribute.metadata.get(to_key)
+		self.to_path: Optional[Tuple[Any, ...]] = _metadata_path(to_path, attribute) if to_path else None
+
+		#: The table of string values shared between instances, for fields marked with the ``intern`` metadata key
+		#: (either :py:obj:`True` or the maximum number of distinct values).
+		self.intern_table: Optional[_InternTable] = None
+		intern = attribute.metadata.get("intern", False)
+		if intern is True:
+			self.intern_table = _InternTable()
+		elif intern:
+			self.intern_table = _InternTable(intern)
+
+		converter: Any = attribute.converter
+
+		#: Whether the converter requires the instance or field (:class:`attrs.Converter`),
+		#: and so can only be called by ``__init__``.
+		self.contextual_converter: bool = bool(
+				getattr(converter, "takes_self", False) or getattr(converter, "takes_field", False)
+				)
+
+		#: The converter as a function taking a single argument.
+		self.converter: Optional[Callable[[Any], Any]] = getattr(converter, "converter", converter)
+
+	def convert(self, value: Any, obj: Any) -> Any:
+		"""
+		Apply the field's converter (if any) to ``value``, as ``__init__`` would.
+
+		:param value:
+		:param obj: The instance the value is for, which is passed to contextual converters.
+		"""
+
+		if self.contextual_converter:
+			converter: Any = self.attribute.converter
+			args = [obj] if converter.takes_self else []
+			if converter.takes_field:
+				args.append(self.attribute)
+			return converter.converter(value, *args)
+		elif self.converter is not None:
+			return self.converter(value)
+		else:
+			return value
+
+
+#: A trie of dictionary paths. Each value is either the field at that path or a nested trie.
+_PathTrie = Dict[Any, Union[_FieldSpec, "_PathTrie"]]
+
+
+def _path_trie(items: Iterable[Tuple[Tuple[Any, ...], _FieldSpec]]) -> _PathTrie:
+	"""
+	Construct a trie from the given paths.
+
+	Later paths replace earlier ones which conflict with them, e.g. ``["a"]`` and ``["a", "b"]``.
+
+	:param items: Pairs of ``(path, field)``.
+
+	:raises ValueError: If a list index and an equal dictionary key (e.g. ``"y[0]"`` and ``["y", 0]``)
+		are used at the same level, as they would be output at the same position.
+	"""
+
+	trie: _PathTrie = {}
+
+	for path, field in items:
+		node = trie
+		for key in path[:-1]:
+			if key in node:
+				_check_key_type(node, key, field)
+			child = node.get(key)
+			if not isinstance(child, dict):
+				child = node[key] = {}
+			node = child
+		if path[-1] in node:
+			_check_key_type(node, path[-1], field)
+		node[path[-1]] = field
+
+	return trie
+
+
+def _check_key_type(node: _PathTrie, key: Any, field: _FieldSpec) -> None:
+	"""
+	Check the given key of a field's path and the equal key already in the level of the trie are of the same type.
+
+	:param node: The level of the trie.
+	:param key:
+	:param field: The field whose path is being added.
+	"""
+
+	existing = next(k for k in node if k == key)
+	if type(existing) is type(key):
+		return
+
+	other = node[existing]
+	if not isinstance(other, _FieldSpec):
+		other = next(_iter_trie(other))[1]
+
+	def describe(k: Any) -> str:
+		return f"list index [{k}]" if type(k) is _Index else f"key {k!r}"
+
+	raise ValueError(
+			f"The paths of the {other.name!r} and {field.name!r} fields collide, "
+			f"as the {describe(existing)} and the {describe(key)} are the same position."
+			)
+
+
+def _is_list_node(trie: _PathTrie) -> bool:
+	"""
+	Returns whether the given level of the layout is output as a list, as its keys are all list indexes.
+
+	:param trie:
+	"""
+
+	return bool(trie) and all(type(key) is _Index for key in trie)
+
+
+class _SerdePlan:
+	"""
+	The compiled ``from_dict`` and ``to_dict`` functions for an attrs class.
+
+	The field metadata is read once, and straight-line Python source is generated for the class,
+	with paths unrolled into subscripts and attributes read directly.
+
+	:param cls: The attrs class.
+	:param from_key: The metadata key giving the path to read each value from.
+	:param to_key: The metadata key giving the path to write each value to.
+	:param parent: The plan of the nearest decorated base class, if ``cls`` is not itself decorated.
+	"""
+
+	def __init__(
+			self,
+			cls: Type[AttrsClass],
+			from_key: str,
+			to_key: str,
+			parent: Optional["_SerdePlan"] = None,
+			):
+		self.cls = cls
+		self.from_key = from_key
+		self.to_key = to_key
+		self.parent = parent
+
+		# A subclass which doesn't add any fields can share the parts of its parent's plan
+		# which don't depend on the class itself, rather than reading the metadata and compiling them again.
+		shared = parent if parent is not None and fields(cls) == fields(parent.cls) else None
+
+		self.fields: List[_FieldSpec]
+		#: The fields which appear in the output of ``to_dict``.
+		#: If no field has a ``to`` path all fields are output, keyed by their names.
+		self.to_fields: List[_FieldSpec]
+		#: The layout of the output of ``to_dict``, as a trie of the paths.
+		self.to_trie: _PathTrie
+		self._decoders: Optional[Dict[str, Callable[[Any], Any]]]
+
+		if shared is not None:
+			self.fields = shared.fields
+			self.to_fields = shared.to_fields
+			self.to_trie = shared.to_trie
+			self._decoders = shared._decoders
+		else:
+			# The fields a subclass inherits unchanged reuse the parent's specs (and their decoders).
+			inherited = {} if parent is None else {f.name: f for f in parent.fields}
+			self.fields = []
+			for attribute in fields(cls):
+				spec = inherited.get(attribute.name)
+				if spec is None or spec.attribute != attribute:
+					spec = _FieldSpec(attribute, from_key, to_key)
+				self.fields.append(spec)
+
+			self.to_fields = [f for f in self.fields if f.to_path is not None]
+
+			if self.to_fields:
+				self.to_trie = _path_trie((f.to_path, f) for f in self.to_fields)  # type: ignore[misc]
 			else:
-				d = {a.name: getattr(self, a.name) for a in fields(self.__class__)}
+				self.to_trie = _path_trie(((f.name, ), f) for f in self.fields)
+
+			# Resolve the field types now if possible, but they may refer to classes which haven't been defined yet.
+			try:
+				self._decoders = self._make_decoders(get_type_hints(cls, localns={cls.__name__: cls}))
+			except (NameError, TypeError, AttributeError):
+				self._decoders = None
+
+		self.from_dict: Callable[[Mapping[str, Any]], Any]
+		if self._decoders is None:
+			self.from_dict = self._deferred_from_dict
+		else:
+			self.from_dict = self._compile_from_dict()
+
+		#: Constructs an instance without calling ``__init__``, converters or validators.
+		#: Compiled on first use, as most classes never need it.
+		self.from_dict_unchecked: Callable[[Mapping[str, Any]], Any] = self._deferred_from_dict_unchecked
+
+		#: Constructs a lazy proxy instance, which decodes each field when it is first accessed.
+		#: The proxy class is created on first use.
+		self.from_dict_lazy: Callable[[Mapping[str, Any]], Any] = self._deferred_from_dict_lazy
+
+		#: The proxy class used by ``from_dict_lazy``, once it has been created.
+		self.lazy_cls: Optional[Type] = None
+
+		#: Encode an instance in the binary format. Compiled on first use.
+		self.to_bytes: Callable[[Any], bytes] = self._deferred_to_bytes
+
+		#: Decode an instance from the binary format. Compiled on first use.
+		self.from_bytes: Callable[[Any], Any] = self._deferred_from_bytes
+
+		#: Encode an instance as JSON text. Compiled on first use.
+		self.to_json: Callable[[Any], str] = self._deferred_to_json
+
+		#: Encode an instance as JSON text, in chunks. Compiled on first use.
+		self.iter_json: Callable[[Any], Iterator[str]] = self._deferred_iter_json
+
+		self.to_dict: Callable[[Any], MutableMapping[str, Any]]
+		self.to_dict_converted: Callable[[Any], MutableMapping[str, Any]]
+		if shared is not None:
+			self.to_dict = shared.to_dict
+			self.to_dict_converted = shared.to_dict_converted
+		else:
+			self.to_dict = self._compile_to_dict(converted=False)
+			self.to_dict_converted = self._compile_to_dict(converted=True, name="to_dict_converted")
+
+		#: Whether the class is frozen, so must be updated by creating a new instance.
+		self.frozen: bool = _is_frozen(cls)
+
+		# Compiled on first use.
+		self._patch_values: Optional[Callable[[Mapping[str, Any]], Dict[str, Any]]] = None
+
+		# Compiled on first use, keyed by ``(converted, snapshot)``.
+		self._delta_functions: Dict[Tuple[bool, bool], Callable[[Any, Any], MutableMapping[str, Any]]]
+
+		#: Functions to get the value of each column output by ``to_columns``, keyed by the ``to`` path.
+		self.column_getters: List[Tuple[Tuple[Any, ...], Callable[[Any], Any]]]
+
+		# Compiled on first use, keyed by the ``include`` and ``exclude`` arguments as given,
+		# and by the names of the fields they select.
+		self._projections: Dict[Tuple[Any, ...], Callable[[Any], MutableMapping[str, Any]]]
+		self._projection_functions: Dict[Tuple[Any, ...], Callable[[Any], MutableMapping[str, Any]]]
+		# Numbers the projection functions, so each is registered with linecache under its own name.
+		self._projection_numbers: Iterator[int]
+
+		if shared is not None:
+			self._delta_functions = shared._delta_functions
+			self.column_getters = shared.column_getters
+			self._projections = shared._projections
+			self._projection_functions = shared._projection_functions
+			self._projection_numbers = shared._projection_numbers
+		else:
+			self._delta_functions = {}
+			self.column_getters = [(path, attrgetter(field.name)) for path, field in _iter_trie(self.to_trie)]
+			self._projections = {}
+			self._projection_functions = {}
+			self._projection_numbers = count()
+
+		#: Function to construct an instance from already-converted values for the ``__init__`` arguments
+		#: (in order), without calling ``__init__``. :py:obj:`None` if that isn't possible for this class.
+		self.build: Optional[Callable[..., Any]] = self._compile_build()
+
+	def __reduce__(self) -> Tuple[Callable, Tuple[Any, ...]]:
+		# Plans are pickled by reference to their class, so a worker process uses its own cached plan
+		# (created when the class was decorated on import) rather than compiling it again.
+		return _get_plan, (self.cls, )
+
+	def from_json(self, data: Union[str, bytes]) -> Any:
+		"""
+		Construct an instance from JSON text.
+
+		:param data:
+		"""
+
+		return self.from_dict(_json_backend.loads(data))
+
+	def from_jsons(self, documents: Iterable[Union[str, bytes]]) -> List[Any]:
+		"""
+		Construct a list of instances from an iterable of JSON documents.
+
+		:param documents:
+		"""
+
+		loads, from_dict = _json_backend.loads, self.from_dict
+		return [from_dict(loads(data)) for data in documents]
+
+	def from_dicts(
+			self,
+			dicts: Iterable[Mapping[str, Any]],
+			workers: Optional[int] = None,
+			chunk_size: Optional[int] = None,
+			) -> List[Any]:
+		"""
+		Construct a list of instances from an iterable of dictionaries.
+
+		:param dicts:
+		:param workers: The number of worker processes to decode the dictionaries in.
+		:param chunk_size: The number of dictionaries to send to a worker process at once.
+		"""
+
+		if workers is None or workers <= 1:
+			return list(map(self.from_dict, dicts))
+
+		if not isinstance(dicts, Sequence):
+			dicts = list(dicts)
+
+		if chunk_size is None:
+			# A few chunks per worker balances the load without too much overhead.
+			chunk_size = max(1, -(-len(dicts) // (workers * 4)))
+
+		chunks = [dicts[start:start + chunk_size] for start in range(0, len(dicts), chunk_size)]
+		if len(chunks) <= 1:
+			return list(map(self.from_dict, dicts))
+
+		with ProcessPoolExecutor(max_workers=min(workers, len(chunks))) as executor:
+			objs = list(chain.from_iterable(executor.map(_decode_chunk, repeat(self), chunks)))
+
+		# Each chunk is unpickled separately, so interned values are only shared within a chunk.
+		for field in self.fields:
+			if field.intern_table is not None:
+				table = field.intern_table
+				for obj in objs:
+					object.__setattr__(obj, field.name, table(getattr(obj, field.name)))
+
+		return objs
 
-			if not to_fields:
-				return d
+	@property
+	def decoders(self) -> Dict[str, Callable[[Any], Any]]:
+		"""
+		Functions to construct nested :deco:`~.serde` classes for each field, keyed by the field name.
+
+		Fields which do not require decoding are omitted.
+		"""
+
+		if self._decoders is None:
+			self._decoders = self._make_decoders(_resolve_field_types(self.cls))
+		return self._decoders
 
-			return curried.reduce(
-					lambda acc, f: curried.update_in(acc, f[1], lambda _: d[f[0].name]),
-					to_fields,
-					{},
+	def _make_decoders(
+			self,
+			field_types: Mapping[str, Any],
+			unchecked: bool = False,
+			) -> Dict[str, Callable[[Any], Any]]:
+		decoders = {}
+
+		# The decoders of fields inherited unchanged from the parent plan are reused, if it has resolved them.
+		parent_decoders: Mapping[str, Callable[[Any], Any]] = {}
+		inherited: Set[_FieldSpec] = set()
+		if self.parent is not None and self.parent._decoders is not None and not unchecked:
+			parent_decoders = self.parent._decoders
+			inherited = set(self.parent.fields)
+
+		for field in self.fields:
+			if field in inherited:
+				if field.name in parent_decoders:
+					decoders[field.name] = parent_decoders[field.name]
+				continue
+
+			decoder = _decoder_for(
+					field_types.get(field.name),
+					self.cls,
+					scalars=field.converter is None,
+					unchecked=unchecked,
+					name=field.name,
 					)
+			if field.intern_table is not None:
+				decoder = field.intern_table if decoder is None else partial(_interned, field.intern_table, decoder)
+			if decoder is not None:
+				decoders[field.name] = decoder
 
-		from_dict.__doc__ = f"""
-		Construct an instance of :class:`~.{cls.__name__}` from a dictionary.
+		return decoders
 
-		:param d: The dictionary.
+	def _deferred_from_dict(self, d: Mapping[str, Any]) -> Any:
 		"""
-		from_dict.__qualname__ = f"{cls.__name__}.from_dict"
-		from_dict.__module__ = cls.__module__
-		cls.from_dict = classmethod(from_dict)
+		Compile ``from_dict`` the first time it is called, once the field types can be resolved.
 
-		to_dict.__doc__ = f"""
-Returns a dictionary containing the contents of the :class:`~.{cls.__name__}` object.
+		:param d:
+		"""
 
-:param convert_values: Recursively convert values into dictionaries, lists etc. as appropriate.
-"""
-		to_dict.__qualname__ = f"{cls.__name__}.to_dict"
-		to_dict.__module__ = cls.__module__
-		cls.to_dict = to_dict
+		self.from_dict = self._compile_from_dict()
+		return self.from_dict(d)
 
-		return cls
+	def _deferred_from_dict_unchecked(self, d: Mapping[str, Any]) -> Any:
+		"""
+		Compile ``from_dict_unchecked`` the first time it is called.
 
-	if cls is not None:
-		return serde_with_class(cls)
-	else:
-		return serde_with_class
+		:param d:
+		"""
+
+		self.from_dict_unchecked = self._compile_from_dict_unchecked()
+		return self.from_dict_unchecked(d)
+
+	def _deferred_from_dict_lazy(self, d: Mapping[str, Any]) -> Any:
+		"""
+		Create the proxy class for ``from_dict_lazy`` the first time it is called.
+
+		:param d:
+		"""
+
+		self.from_dict_lazy = self._make_from_dict_lazy()
+		return self.from_dict_lazy(d)
+
+	def _make_from_dict_lazy(self) -> Callable[[Mapping[str, Any]], Any]:
+		cls = self.cls
+		namespace: Dict[str, Any] = {
+				"__slots__": ("_serde_source", ),
+				"__module__": cls.__module__,
+				"__qualname__": cls.__qualname__,
+				"__doc__": cls.__doc__,
+				# Instances claim to be of the original class, so they compare equal to its instances.
+				"__class__": property(lambda self: cls),
+				"__reduce__": _reduce_lazy,
+				}
+
+		for field in self.fields:
+			lazy_property = _lazy_property(field, self.decoders.get(field.name), cls)
+			if lazy_property is not None:
+				namespace[field.name] = lazy_property
+
+		lazy_cls = self.lazy_cls = type(cls.__name__, (cls, ), namespace)
+		_plans[lazy_cls] = self
+
+		new = object.__new__
+		set_source = lazy_cls._serde_source.__set__  # type: ignore[attr-defined]
+		hash_code = getattr(cls.__hash__, "__code__", None)
+
+		if hash_code is not None and "_attrs_cached_hash" in hash_code.co_names:
+
+			def from_dict_lazy(d: Mapping[str, Any]) -> Any:
+				obj: Any = new(lazy_cls)
+				set_source(obj, d)
+				object.__setattr__(obj, "_attrs_cached_hash", None)
+				return obj
+
+		else:
+
+			def from_dict_lazy(d: Mapping[str, Any]) -> Any:
+				obj: Any = new(lazy_cls)
+				set_source(obj, d)
+				return obj
+
+		return from_dict_lazy
+
+	def _deferred_to_bytes(self, obj: Any) -> bytes:
+		"""
+		Compile ``to_bytes`` and ``from_bytes`` the first time ``to_bytes`` is called.
+
+		:param obj:
+		"""
+
+		self._compile_binary()
+		return self.to_bytes(obj)
+
+	def _deferred_from_bytes(self, data: Any) -> Any:
+		"""
+		Compile ``to_bytes`` and ``from_bytes`` the first time ``from_bytes`` is called.
+
+		:param data:
+		"""
+
+		self._compile_binary()
+		return self.from_bytes(data)
+
+	def _compile_binary(self) -> None:
+		"""
+		Compile the ``to_bytes`` and ``from_bytes`` functions.
+
+		The encoding starts with a :mod:`struct` header containing the schema fingerprint,
+		followed by each ``__init__`` field in order: the value of non-optional :class:`bool`, :class:`int`
+		and :class:`float` fields, or the length of the encoded value of other fields (``-1`` for :py:obj:`None`).
+		The encoded values of those other fields follow the header, in order.
+		"""
+
+		field_types = _resolve_field_types(self.cls)
+		header_codes = ["8s"]
+		schema = []
+		encode_namespace: Dict[str, Any] = {}
+		decode_namespace: Dict[str, Any] = {"_build": self.build_unchecked}
+		encode_lines = ["def to_bytes(self):", "\tparts = []"]
+		pack_args = ["_fingerprint"]
+		decode_lines = ["def from_bytes(data):", "\tview = memoryview(data)"]
+		unpack_targets = ["fingerprint"]
+		decode_body = ["\tpos = _header_size"]
+		build_args = []
+
+		for idx, field in enumerate(self.fields):
+			if not field.attribute.init:
+				continue
+
+			var = f"_{idx}"
+			tp: Any = field_types.get(field.name, field.attribute.type)
+			build_args.append(var)
+
+			optional = False
+			if get_origin(tp) in _UNION_TYPES:
+				not_none = [arg for arg in get_args(tp) if arg is not type(None)]
+				if len(not_none) == 1:
+					optional, tp = True, not_none[0]
+
+			scalar_type = next((t for t in _BINARY_SCALAR_CODES if isinstance(tp, type) and issubclass(tp, t)), None)
+
+			if scalar_type is not None and not optional:
+				# Stored in the header
+				header_codes.append(_BINARY_SCALAR_CODES[scalar_type])
+				schema.append((field.name, _BINARY_SCALAR_CODES[scalar_type]))
+				pack_args.append(f"self.{field.name}")
+				unpack_targets.append(var)
+				if tp is not scalar_type:
+					# e.g. IntEnum
+					decode_namespace[f"_type{var}"] = tp
+					decode_body.append(f"\t{var} = _type{var}({var})")
+				continue
+
+			encoder: Optional[Callable[[Any], Any]]
+			decoder: Optional[Callable[[Any], Any]]
+
+			if scalar_type is not None:
+				kind = _BINARY_SCALAR_CODES[scalar_type]
+				packer = struct.Struct('<' + kind)
+				encoder = packer.pack
+				decoder = partial(_unpack_scalar, packer, None if tp is scalar_type else tp)
+			elif tp is str:
+				kind, encoder, decoder = "str", str.encode, _decode_utf8
+				if field.intern_table is not None:
+					decoder = partial(_interned, field.intern_table, decoder)
+			elif tp in _BINARY_BYTES_TYPES:
+				kind, encoder, decoder = "bytes", None, None
+			elif tp is self.cls or _is_serde_class(tp):
+				kind, encoder, decoder = f"serde {tp.__qualname__}", _serde_to_bytes, partial(_serde_from_bytes, tp)
+			else:
+				kind, encoder = "json", _json_bytes
+				# JSON loses the type of tuples, sets etc., which the converter (if any) restores.
+				converter = None if field.contextual_converter else field.converter
+				decoder = partial(_json_from_bytes, self.decoders.get(field.name, _identity), converter or _identity)
+
+			schema.append((field.name, kind))
+			header_codes.append('i')
+			pack_args.append(f"_n{var}")
+			unpack_targets.append(f"_n{var}")
+
+			encode_lines.append(f"\t{var} = self.{field.name}")
+			encode_lines.append(f"\tif {var} is None:")
+			encode_lines.append(f"\t\t_n{var} = -1")
+			encode_lines.append("\telse:")
+			if encoder is not None:
+				encode_namespace[f"_encode{var}"] = encoder
+				encode_lines.append(f"\t\t{var} = _encode{var}({var})")
+			encode_lines.append(f"\t\t_n{var} = len({var})")
+			encode_lines.append(f"\t\tparts.append({var})")
+
+			decode_body.append(f"\tif _n{var} < 0:")
+			decode_body.append(f"\t\t{var} = None")
+			decode_body.append("\telse:")
+			decode_body.append(f"\t\tend = pos + _n{var}")
+			if decoder is not None:
+				decode_namespace[f"_decode{var}"] = decoder
+				decode_body.append(f"\t\t{var} = _decode{var}(view[pos:end])")
+			else:
+				decode_body.append(f"\t\t{var} = view[pos:end]")
+			decode_body.append("\t\tpos = end")
+
+		header = struct.Struct('<' + ''.join(header_codes))
+		fingerprint = hashlib.blake2b(repr(schema).encode("UTF-8"), digest_size=8).digest()
+
+		#: A hash of the names and encodings of the fields, which is checked by ``from_bytes``.
+		self.binary_fingerprint = fingerprint
+
+		encode_namespace.update(_pack=header.pack, _fingerprint=fingerprint)
+		encode_lines.append(f"\treturn b''.join((_pack({', '.join(pack_args)}), *parts))")
+
+		decode_namespace.update(
+				_unpack_from=header.unpack_from,
+				_fingerprint=fingerprint,
+				_header_size=header.size,
+				)
+		decode_lines.append(f"\t{', '.join(unpack_targets)}, = _unpack_from(view)")
+		decode_lines.append("\tif fingerprint != _fingerprint:")
+		decode_lines.append(
+				f"\t\traise ValueError({f'The data was not encoded by {self.cls.__qualname__}.to_bytes, '!r} "
+				"'or the class has changed since.')"
+				)
+		decode_lines.extend(decode_body)
+		decode_lines.append("\tif pos != view.nbytes:")
+		decode_lines.append("\t\traise ValueError(f'Expected {pos} bytes of data, got {view.nbytes}.')")
+		decode_lines.append(f"\treturn _build({', '.join(build_args)})")
+
+		self.to_bytes = _make_function("to_bytes", encode_lines, encode_namespace, self.cls)
+		self.from_bytes = _make_function("from_bytes", decode_lines, decode_namespace, self.cls)
+
+	def _deferred_to_json(self, obj: Any) -> str:
+		"""
+		Compile ``to_json`` and ``iter_json`` the first time ``to_json`` is called.
+
+		:param obj:
+		"""
+
+		self._compile_json()
+		return self.to_json(obj)
+
+	def _deferred_iter_json(self, obj: Any) -> Iterator[str]:
+		"""
+		Compile ``to_json`` and ``iter_json`` the first time ``iter_json`` is called.
+
+		:param obj:
+		"""
+
+		self._compile_json()
+		return self.iter_json(obj)
+
+	def _compile_json(self) -> None:
+		"""
+		Compile the ``to_json`` and ``iter_json`` functions.
+
+		The JSON text between the values of the fields (the brackets, and the escaped keys of each ``to`` path)
+		is rendered once, so each call only encodes the values themselves.
+		"""
+
+		texts = ['']
+		template_fields: List[_FieldSpec] = []
+		_json_template(self.to_trie, texts, template_fields)
+
+		field_types = _resolve_field_types(self.cls)
+		namespace: Dict[str, Any] = {
+				"_join": ''.join,
+				"_value": _json_value,
+				"_iter_value": _iter_json_value,
+				"_encode_str": _encode_json_str,
+				"_int_repr": int.__repr__,
+				}
+		parts = []
+		iter_lines = ["def iter_json(self):"]
+
+		for idx, (text, field) in enumerate(zip(texts, template_fields)):
+			var = f"self.{field.name}"
+
+			# Values of the expected type are encoded without the function call to _value.
+			tp = field_types.get(field.name, field.attribute.type)
+			if tp is str:
+				value = f"(_encode_str({var}) if {var}.__class__ is str else _value({var}))"
+			elif tp is int:
+				value = f"(_int_repr({var}) if {var}.__class__ is int else _value({var}))"
+			else:
+				value = f"_value({var})"
+
+			parts.extend([repr(text), value])
+			iter_lines.append(f"\tyield from _iter_value({text!r}, {var})")
+
+		parts.append(repr(texts[-1]))
+		iter_lines.append(f"\tyield {texts[-1]!r}")
+
+		to_json_lines = ["def to_json(self):", f"\treturn _join(({', '.join(parts)}, ))"]
+
+		self.to_json = _make_function("to_json", to_json_lines, namespace, self.cls)
+		self.iter_json = _make_function("iter_json", iter_lines, namespace, self.cls)
+
+	def _compile_build(self) -> Optional[Callable[..., Any]]:
+		if hasattr(self.cls, "__attrs_pre_init__") or any(f.contextual_converter for f in self.fields):
+			return None
+
+		namespace: Dict[str, Any] = {
+				"cls": self.cls,
+				"_new": object.__new__,
+				"_setattr": object.__setattr__,
+				"_validators_disabled": get_disabled,
+				"NOTHING": NOTHING,
+				"_MISSING": _MISSING,
+				}
+		args = []
+		body = ["\tself = _new(cls)"]
+		validate = []
+
+		for idx, field in enumerate(self.fields):
+			attribute = field.attribute
+			var = f"_{idx}"
+			default: Any = attribute.default
+			namespace[f"_attr{var}"] = attribute
+			namespace[f"_default{var}"] = getattr(default, "factory", default)
+			namespace[f"_converter{var}"] = field.converter
+
+			def convert(value: str) -> str:
+				return f"_converter{var}({value})" if field.converter is not None else value  # noqa: B023
+
+			if attribute.init:
+				args.append(var)
+				if isinstance(default, Factory) and default.takes_self:  # type: ignore[arg-type]
+					body.append(f"\tif {var} is _MISSING:")
+					body.append(f"\t\t{var} = {convert(f'_default{var}(self)')}")
+				body.append(f"\t_setattr(self, {field.name!r}, {var})")
+			elif default is NOTHING:
+				continue
+			elif isinstance(default, Factory):  # type: ignore[arg-type]
+				factory_args = "self" if default.takes_self else ''
+				body.append(f"\t_setattr(self, {field.name!r}, {convert(f'_default{var}({factory_args})')})")
+			else:
+				body.append(f"\t_setattr(self, {field.name!r}, {convert(f'_default{var}')})")
+
+			if attribute.validator is not None:
+				namespace[f"_validator{var}"] = attribute.validator
+				validate.append(f"\t\t_validator{var}(self, _attr{var}, self.{field.name})")
+
+		hash_code = getattr(self.cls.__hash__, "__code__", None)
+		if hash_code is not None and "_attrs_cached_hash" in hash_code.co_names:
+			body.append("\t_setattr(self, '_attrs_cached_hash', None)")
+
+		if validate:
+			body.append("\tif not _validators_disabled():")
+			body.extend(validate)
+
+		if hasattr(self.cls, "__attrs_post_init__"):
+			body.append("\tself.__attrs_post_init__()")
+
+		body.append("\treturn self")
+
+		return _make_function("build", [f"def build({', '.join(args)}):", *body], namespace, self.cls)
+
+	def to_columns(self, objs: Iterable[Any]) -> Dict[Tuple[Any, ...], List[Any]]:
+		"""
+		Returns a mapping of ``to`` paths to lists of the values of the corresponding field for each object.
+
+		:param objs:
+		"""
+
+		if not isinstance(objs, Sequence):
+			objs = list(objs)
+
+		return {path: list(map(getter, objs)) for path, getter in self.column_getters}
+
+	def from_columns(self, columns: Mapping[Tuple[Any, ...], Sequence[Any]]) -> List[Any]:
+		"""
+		Construct a list of instances from a mapping of ``from`` paths to lists of values.
+
+		Converters are applied once to each column, rather than for each instance.
+
+		:param columns:
+		"""
+
+		lengths = set(map(len, columns.values()))
+		if len(lengths) > 1:
+			raise ValueError("All columns must be the same length.")
+
+		by_path = {f.from_path: f.name for f in self.fields if f.attribute.init}
+		for path in columns:
+			if path not in by_path:
+				raise ValueError(f"{path!r} is not the 'from' path of any field of {self.cls.__qualname__!r}.")
+
+		return self._construct_columns(
+				{by_path[path]: column for path, column in columns.items()},
+				lengths.pop() if lengths else 0,
+				)
+
+	def _construct_columns(self, columns: Mapping[str, Sequence[Any]], length: int) -> List[Any]:
+		"""
+		Construct a list of instances from columns of values.
+
+		:param columns: Mapping of attribute names to lists of values.
+			Fields without a column take their default values.
+		:param length: The number of instances.
+		"""
+
+		init_fields = [f for f in self.fields if f.attribute.init]
+		values: List[Optional[Sequence[Any]]] = []
+
+		for field in init_fields:
+			default: Any = field.attribute.default
+			column: Optional[Sequence[Any]]
+
+			if field.name in columns:
+				column = columns[field.name]
+				if field.name in self.decoders:
+					column = list(map(self.decoders[field.name], column))
+			elif isinstance(default, Factory) and default.takes_self:  # type: ignore[arg-type]
+				# Computed from the instance: by ``build``, or by ``__init__`` if the argument is omitted.
+				values.append([_MISSING] * length if self.build is not None else None)
+				continue
+			elif isinstance(default, Factory):  # type: ignore[arg-type]
+				column = [default.factory() for _ in range(length)]
+			else:
+				column = [default] * length
+
+			if self.build is not None and field.converter is not None:
+				column = list(map(field.converter, column))
+
+			values.append(column)
+
+		if self.build is not None:
+			return list(map(self.build, *values))  # type: ignore[arg-type]
+
+		names = [f.init_name for f, v in zip(init_fields, values) if v is not None]
+		return [self.cls(**dict(zip(names, row))) for row in zip(*(v for v in values if v is not None))]
+
+	@property
+	def record_dtype(self) -> "numpy.dtype":
+		"""
+		The NumPy structured dtype for the class, derived from the field types.
+
+		This is computed the first time it is used, as it requires NumPy.
+		"""
+
+		try:
+			return self._record_dtype
+		except AttributeError:
+			pass
+
+		np = _import_numpy()
+
+		type_hints = _resolve_field_types(self.cls)
+		dtype = []
+
+		for field in self.fields:
+			if "dtype" in field.attribute.metadata:
+				field_dtype = np.dtype(field.attribute.metadata["dtype"])
+			else:
+				field_dtype = _numpy_dtype(np, type_hints.get(field.name, field.attribute.type))
+
+			if field_dtype is None:
+				raise TypeError(
+						f"Cannot determine the NumPy dtype for the field {field.name!r} of {self.cls.__qualname__!r}. "
+						"Numeric, bool, str and bytes fields are supported, "
+						"with the width of str and bytes fields given by the 'dtype' metadata key.",
+						)
+
+			dtype.append((field.name, field_dtype))
+
+		self._record_dtype: "numpy.dtype" = np.dtype(dtype)
+		return self._record_dtype
+
+	def to_records(self, objs: Iterable[Any]) -> "numpy.ndarray":
+		"""
+		Returns a NumPy structured array containing the values of the fields of the given objects.
+
+		:param objs:
+		"""
+
+		np = _import_numpy()
+
+		if not isinstance(objs, Sequence):
+			objs = list(objs)
+
+		array = np.empty(len(objs), dtype=self.record_dtype)
+		for field in self.fields:
+			array[field.name] = list(map(attrgetter(field.name), objs))
+
+		return array
+
+	def from_records(self, array: "numpy.ndarray") -> List[Any]:
+		"""
+		Construct a list of instances from a NumPy structured array.
+
+		:param array:
+		"""
+
+		names = array.dtype.names or ()
+		return self._construct_columns(
+				{f.name: array[f.name].tolist() for f in self.fields if f.name in names},
+				len(array),
+				)
+
+	def _compile_from_dict(self) -> Callable[[Mapping[str, Any]], Any]:
+		namespace: Dict[str, Any] = {"cls": self.cls, "NOTHING": NOTHING, "_LOOKUP_ERRORS": _LOOKUP_ERRORS}
+		lines = ["def from_dict(d):"]
+		args = []
+		uses_kwargs = False
+
+		for idx, field in enumerate(self.fields):
+			attribute = field.attribute
+			if not attribute.init:
+				continue
+
+			var = f"_{idx}"
+			default: Any = attribute.default
+			decoder = self.decoders.get(field.name)
+			lines.append("\ttry:")
+			lines.append(f"\t\t{var} = {_subscript('d', field.from_path, namespace)}")
+			lines.append("\texcept _LOOKUP_ERRORS:")
+
+			if isinstance(default, Factory) and default.takes_self:  # type: ignore[arg-type]
+				# The default can only be computed by __init__, so omit the argument.
+				uses_kwargs = True
+				lines.append("\t\tpass")
+				lines.append("\telse:")
+				if decoder is not None:
+					namespace[f"_decode{var}"] = decoder
+					lines.append(f"\t\tkw[{field.init_name!r}] = _decode{var}({var})")
+				else:
+					lines.append(f"\t\tkw[{field.init_name!r}] = {var}")
+				continue
+
+			if default is NOTHING:
+				lines.append(f"\t\t{var} = NOTHING")
+			elif isinstance(default, Factory):  # type: ignore[arg-type]
+				namespace[f"_default{var}"] = default.factory
+				lines.append(f"\t\t{var} = _default{var}()")
+			else:
+				namespace[f"_default{var}"] = default
+				lines.append(f"\t\t{var} = _default{var}")
+
+			if decoder is not None:
+				namespace[f"_decode{var}"] = decoder
+				lines.append("\telse:")
+				lines.append(f"\t\t{var} = _decode{var}({var})")
+
+			args.append(f"{field.init_name}={var}")
+
+		if uses_kwargs:
+			lines.insert(1, "\tkw = {}")
+			args.append("**kw")
+
+		lines.append(f"\treturn cls({', '.join(args)})")
+
+		return _make_function("from_dict", lines, namespace, self.cls)
+
+	def _compile_from_dict_unchecked(self) -> Callable[[Mapping[str, Any]], Any]:
+		namespace: Dict[str, Any] = {
+				"cls": self.cls,
+				"_new": object.__new__,
+				"_setattr": object.__setattr__,
+				"NOTHING": NOTHING,
+				"_LOOKUP_ERRORS": _LOOKUP_ERRORS,
+				}
+		lines = ["def from_dict_unchecked(d):", "\tself = _new(cls)"]
+		decoders = self._make_decoders(_resolve_field_types(self.cls), unchecked=True)
+		assign = self._assigner(lines)
+
+		for idx, field in enumerate(self.fields):
+			attribute = field.attribute
+			var = f"_{idx}"
+			default: Any = attribute.default
+
+			if isinstance(default, Factory):  # type: ignore[arg-type]
+				namespace[f"_default{var}"] = default.factory
+				default_source = f"_default{var}({'self' if default.takes_self else ''})"
+			elif default is not NOTHING:
+				namespace[f"_default{var}"] = default
+				default_source = f"_default{var}"
+			elif attribute.init:
+				# Matches ``from_dict``, which passes NOTHING to ``__init__``.
+				default_source = "NOTHING"
+			else:
+				continue
+
+			if not attribute.init:
+				lines.append(assign(field, default_source))
+				continue
+
+			lines.append("\ttry:")
+			lines.append(f"\t\t{var} = {_subscript('d', field.from_path, namespace)}")
+			lines.append("\texcept _LOOKUP_ERRORS:")
+			lines.append(f"\t\t{var} = {default_source}")
+
+			if field.name in decoders:
+				namespace[f"_decode{var}"] = decoders[field.name]
+				lines.append("\telse:")
+				lines.append(f"\t\t{var} = _decode{var}({var})")
+
+			lines.append(assign(field, var))
+
+		lines.extend(self._unchecked_epilogue())
+
+		return _make_function("from_dict_unchecked", lines, namespace, self.cls)
+
+	def _assigner(self, lines: List[str]) -> Callable[[_FieldSpec, str], str]:
+		"""
+		Returns a function giving the source to set an attribute of ``self`` in a generated function,
+		bypassing ``__setattr__``.
+
+		:param lines: The lines of the function, which may be added to.
+		"""
+
+		# Writing to the instance dictionary is quickest, but isn't possible for slotted attributes.
+		if any(isinstance(getattr(self.cls, f.name, None), types.MemberDescriptorType) for f in self.fields):
+
+			def assign(field: _FieldSpec, value: str) -> str:
+				return f"\t_setattr(self, {field.name!r}, {value})"
+
+		else:
+			lines.append("\t_dict = self.__dict__")
+
+			def assign(field: _FieldSpec, value: str) -> str:
+				return f"\t_dict[{field.name!r}] = {value}"
+
+		return assign
+
+	def _unchecked_epilogue(self) -> List[str]:
+		"""
+		Returns the final lines of a generated function which constructs ``self`` without calling ``__init__``.
+		"""
+
+		lines = []
+
+		hash_code = getattr(self.cls.__hash__, "__code__", None)
+		if hash_code is not None and "_attrs_cached_hash" in hash_code.co_names:
+			lines.append("\t_setattr(self, '_attrs_cached_hash', None)")
+
+		if hasattr(self.cls, "__attrs_post_init__"):
+			lines.append("\tself.__attrs_post_init__()")
+
+		lines.append("\treturn self")
+		return lines
+
+	@property
+	def build_unchecked(self) -> Callable[..., Any]:
+		"""
+		Function to construct an instance from the values for the ``__init__`` arguments (in order),
+		without calling ``__init__``, converters or validators.
+
+		This is compiled the first time it is used.
+		"""
+
+		try:
+			return self._build_unchecked
+		except AttributeError:
+			pass
+
+		namespace: Dict[str, Any] = {"cls": self.cls, "_new": object.__new__, "_setattr": object.__setattr__}
+		args = []
+		body = ["\tself = _new(cls)"]
+		assign = self._assigner(body)
+
+		for idx, field in enumerate(self.fields):
+			var = f"_{idx}"
+			default: Any = field.attribute.default
+
+			if field.attribute.init:
+				args.append(var)
+				body.append(assign(field, var))
+			elif isinstance(default, Factory):  # type: ignore[arg-type]
+				namespace[f"_default{var}"] = default.factory
+				body.append(assign(field, f"_default{var}({'self' if default.takes_self else ''})"))
+			elif default is not NOTHING:
+				namespace[f"_default{var}"] = default
+				body.append(assign(field, f"_default{var}"))
+
+		body.extend(self._unchecked_epilogue())
+
+		self._build_unchecked: Callable[..., Any] = _make_function(
+				"build_unchecked",
+				[f"def build_unchecked({', '.join(args)}):", *body],
+				namespace,
+				self.cls,
+				)
+		return self._build_unchecked
+
+	@property
+	def reduce(self) -> Callable[[Any], Tuple[Any, ...]]:
+		"""
+		Function returning the value for ``__reduce_ex__`` when the class uses ``compact_pickle``.
+
+		This is compiled the first time it is used.
+		"""
+
+		try:
+			return self._reduce
+		except AttributeError:
+			pass
+
+		namespace: Dict[str, Any] = {"cls": self.cls, "_unpickle": _unpickle, "_getattr": getattr, "NOTHING": NOTHING}
+		values = []
+
+		for field in self.fields:
+			if field.attribute.init or field.attribute.default is not NOTHING:
+				values.append(f"self.{field.name}")
+			else:
+				# May not have been set.
+				values.append(f"_getattr(self, {field.name!r}, NOTHING)")
+
+		lines = ["def reduce(self):", f"\treturn _unpickle, (cls, {', '.join(values)})"]
+
+		self._reduce: Callable[[Any], Tuple[Any, ...]] = _make_function("reduce", lines, namespace, self.cls)
+		return self._reduce
+
+	@property
+	def restore(self) -> Callable[..., Any]:
+		"""
+		Function to construct an instance from the values of all of its fields (in order),
+		without calling ``__init__``, converters or validators. This is the inverse of :attr:`~.reduce`.
+
+		This is compiled the first time it is used.
+		"""
+
+		try:
+			return self._restore
+		except AttributeError:
+			pass
+
+		namespace: Dict[str, Any] = {
+				"cls": self.cls,
+				"_new": object.__new__,
+				"_setattr": object.__setattr__,
+				"NOTHING": NOTHING,
+				}
+		args = []
+		body = ["\tself = _new(cls)"]
+		assign = self._assigner(body)
+
+		for idx, field in enumerate(self.fields):
+			var = f"_{idx}"
+			args.append(var)
+			if field.attribute.init or field.attribute.default is not NOTHING:
+				body.append(assign(field, var))
+			else:
+				body.append(f"\tif {var} is not NOTHING:")
+				body.append('\t' + assign(field, var))
+
+		hash_code = getattr(self.cls.__hash__, "__code__", None)
+		if hash_code is not None and "_attrs_cached_hash" in hash_code.co_names:
+			body.append("\t_setattr(self, '_attrs_cached_hash', None)")
+
+		body.append("\treturn self")
+
+		self._restore: Callable[..., Any] = _make_function(
+				"restore",
+				[f"def restore({', '.join(args)}):", *body],
+				namespace,
+				self.cls,
+				)
+		return self._restore
+
+	def update_from_dict(self, obj: Any, d: Mapping[str, Any]) -> Any:
+		"""
+		Update ``obj`` with the values of the fields whose ``from`` paths are present in ``d``.
+
+		Mutable instances are updated in place and returned. For frozen classes a new instance is returned.
+
+		:param obj:
+		:param d: A partial dictionary.
+		"""
+
+		if self._patch_values is None:
+			self._patch_values = self._compile_patch_values()
+
+		values = self._patch_values(d)
+		if not values:
+			return obj
+
+		fields_by_name = {field.name: field for field in self.fields}
+
+		if self.frozen:
+			if self.build is None:
+				return evolve(obj, **{fields_by_name[name].init_name: v for name, v in values.items()})
+
+			args = []
+			for field in self.fields:
+				if not field.attribute.init:
+					continue
+				elif field.name in values:
+					args.append(field.convert(values[field.name], obj))
+				else:
+					args.append(getattr(obj, field.name))
+
+			return self.build(*args)
+
+		# The converters and validators are run here, and the attributes then set directly,
+		# as whether the class's ``on_setattr`` hooks would run them again isn't exposed by attrs.
+		for name in values:
+			hook = fields_by_name[name].attribute.on_setattr
+			if hook is setters.frozen:
+				raise FrozenAttributeError()
+			elif hook not in _PLAIN_SETATTR_HOOKS:
+				raise TypeError(
+						f"Cannot update the {name!r} field of {self.cls.__qualname__!r} "
+						f"as the effect of its on_setattr hook {hook!r} is unknown."
+						)
+
+		for name, value in values.items():
+			field = fields_by_name[name]
+			value = field.convert(value, obj)
+			if field.attribute.validator is not None and not get_disabled():
+				field.attribute.validator(obj, field.attribute, value)
+			object.__setattr__(obj, name, value)
+
+		return obj
+
+	def _compile_patch_values(self) -> Callable[[Mapping[str, Any]], Dict[str, Any]]:
+		namespace: Dict[str, Any] = {"_LOOKUP_ERRORS": _LOOKUP_ERRORS}
+		lines = ["def patch_values(d):", "\tvalues = {}"]
+
+		for idx, field in enumerate(self.fields):
+			if not field.attribute.init:
+				continue
+
+			var = f"_{idx}"
+			lines.append("\ttry:")
+			lines.append(f"\t\t{var} = {_subscript('d', field.from_path, namespace)}")
+			lines.append("\texcept _LOOKUP_ERRORS:")
+			lines.append("\t\tpass")
+			lines.append("\telse:")
+
+			if field.name in self.decoders:
+				namespace[f"_decode{var}"] = self.decoders[field.name]
+				lines.append(f"\t\tvalues[{field.name!r}] = _decode{var}({var})")
+			else:
+				lines.append(f"\t\tvalues[{field.name!r}] = {var}")
+
+		lines.append("\treturn values")
+
+		return _make_function("patch_values", lines, namespace, self.cls)
+
+	def to_dict_delta(
+			self,
+			obj: Any,
+			previous: Any,
+			converted: bool = False,
+			) -> Tuple[MutableMapping[str, Any], List[Tuple[Any, ...]]]:
+		"""
+		Returns the parts of the ``to_dict`` output for ``obj`` which differ from ``previous``,
+		and the paths in ``previous`` which are no longer present.
+
+		:param obj:
+		:param previous: An earlier instance, or the output of its ``to_dict`` method.
+		:param converted: Whether to compare and return values as converted by ``to_dict(convert_values=True)``.
+		"""
+
+		if not isinstance(previous, Mapping):
+			previous_plan = _get_plan(type(previous))
+			if previous_plan is self:
+				return self._delta_function(converted, snapshot=False)(obj, previous), []
+
+			# A different class, which may have a different layout.
+			if converted:
+				previous = previous_plan.to_dict_converted(previous)
+			else:
+				previous = previous_plan.to_dict(previous)
+
+		return self._delta_function(converted, snapshot=True)(obj, previous), _removed_paths(previous, self.to_trie)
+
+	def _delta_function(self, converted: bool, snapshot: bool) -> Callable[[Any, Any], MutableMapping[str, Any]]:
+		try:
+			return self._delta_functions[converted, snapshot]
+		except KeyError:
+			function = self._delta_functions[converted, snapshot] = self._compile_delta(converted, snapshot)
+			return function
+
+	def _compile_delta(self, converted: bool, snapshot: bool) -> Callable[[Any, Any], MutableMapping[str, Any]]:
+		namespace: Dict[str, Any] = {"_convert": _convert_value, "_LOOKUP_ERRORS": _LOOKUP_ERRORS}
+		lines = ["def to_dict_delta(self, previous):", "\tchanged = {}"]
+
+		for idx, (path, field) in enumerate(_iter_trie(self.to_trie)):
+			var = f"_{idx}"
+			value = f"_convert(self.{field.name})" if converted else f"self.{field.name}"
+			# Levels output as lists by to_dict are dictionaries keyed by index here, as the delta is sparse.
+			*parents, last = (_literal(key, namespace) for key in path)
+			assign = "changed" + ''.join(f".setdefault({key}, {{}})" for key in parents) + f"[{last}] = {var}"
+
+			if snapshot:
+				lines.append(f"\t{var} = {value}")
+				lines.append("\ttry:")
+				lines.append(f"\t\tprevious{var} = {_subscript('previous', path, namespace)}")
+				lines.append("\texcept _LOOKUP_ERRORS:")
+				lines.append(f"\t\t{assign}")
+				lines.append("\telse:")
+				lines.append(f"\t\tif {var} is not previous{var} and {var} != previous{var}:")
+				lines.append(f"\t\t\t{assign}")
+			else:
+				# Comparing the attributes directly avoids converting unchanged values.
+				lines.append(f"\t{var} = self.{field.name}")
+				lines.append(f"\tprevious{var} = previous.{field.name}")
+				lines.append(f"\tif {var} is not previous{var} and {var} != previous{var}:")
+				if converted:
+					lines.append(f"\t\t{var} = _convert({var})")
+				lines.append(f"\t\t{assign}")
+
+		lines.append("\treturn changed")
+
+		return _make_function("to_dict_delta", lines, namespace, self.cls)
+
+	def projection(
+			self,
+			include: Optional[Iterable[_Selector]],
+			exclude: Optional[Iterable[_Selector]],
+			converted: bool = False,
+			) -> Callable[[Any], MutableMapping[str, Any]]:
+		"""
+		Returns a ``to_dict`` function which only outputs the given subset of the fields.
+
+		The function is compiled the first time each projection is used.
+
+		:param include: The fields to output, or :py:obj:`None` for all fields.
+		:param exclude: The fields to omit.
+		:param converted: Whether to convert values as for ``to_dict(convert_values=True)``.
+
+		Fields are selected by attribute name, or by a prefix of their ``to`` path
+		(a single key, or a sequence of keys).
+		"""
+
+		key = (_selector_key(include), _selector_key(exclude), converted)
+
+		try:
+			return self._projections[key]
+		except KeyError:
+			pass
+
+		selected = self._select_fields(key[0], key[1])
+
+		if selected == [field for path, field in _iter_trie(self.to_trie)]:
+			function = self.to_dict_converted if converted else self.to_dict
+		else:
+			# Different selectors may select the same fields, which can share a function.
+			names = (tuple(field.name for field in selected), converted)
+			try:
+				function = self._projection_functions[names]
+			except KeyError:
+				name = f"to_dict_projection{next(self._projection_numbers)}"
+				function = self._compile_to_dict(converted, selected, name)
+				_cache_bounded(self._projection_functions, names, function)
+
+		_cache_bounded(self._projections, key, function)
+		return function
+
+	def _select_fields(
+			self,
+			include: Optional[Tuple[_Selector, ...]],
+			exclude: Optional[Tuple[_Selector, ...]],
+			) -> List[_FieldSpec]:
+		"""
+		Returns the fields output by ``to_dict`` which are selected by ``include`` and not by ``exclude``.
+
+		:param include:
+		:param exclude:
+		"""
+
+		paths = list(_iter_trie(self.to_trie))
+
+		def matching(selectors: Tuple[_Selector, ...]) -> Set[str]:
+			names = set()
+
+			for selector in selectors:
+				if isinstance(selector, str):
+					matches = {f.name for path, f in paths if selector == f.name or path[0] == selector}
+				else:
+					matches = {f.name for path, f in paths if path[:len(selector)] == selector}
+
+				if not matches:
+					raise ValueError(f"{selector!r} does not match any field of {self.cls.__qualname__!r}.")
+				names.update(matches)
+
+			return names
+
+		included = None if include is None else matching(include)
+		excluded = set() if exclude is None else matching(exclude)
+
+		return [
+				field for path, field in paths
+				if (included is None or field.name in included) and field.name not in excluded
+				]
+
+	def _compile_to_dict(
+			self,
+			converted: bool,
+			selected: Optional[List[_FieldSpec]] = None,
+			name: str = "to_dict",
+			) -> Callable[[Any], MutableMapping[str, Any]]:
+		"""
+		Compile the ``to_dict`` function.
+
+		:param converted: Whether to convert values as for ``to_dict(convert_values=True)``.
+		:param selected: The fields to output, if not all of them.
+		:param name: The name of the function, which must be distinct for each function compiled for the class
+			so their source is registered with :mod:`linecache` separately.
+		"""
+
+		trie = self.to_trie
+		if selected is not None:
+			trie = _path_trie((path, field) for path, field in _iter_trie(trie) if field in selected)
+
+		namespace: Dict[str, Any] = {"_convert": _convert_value}
+		lines = [f"def {name}(self):"]
+
+		if converted:
+
+			def value(field: _FieldSpec) -> str:
+				return f"_convert(self.{field.name})"
+
+		else:
+
+			def value(field: _FieldSpec) -> str:
+				return f"self.{field.name}"
+
+		lines.append(f"\treturn {_trie_source(trie, value, namespace)}")
+
+		return _make_function(name, lines, namespace, self.cls)
+
+
+def _json_template(trie: _PathTrie, texts: List[str], template_fields: List[_FieldSpec]) -> None:
+	"""
+	Render the JSON text of the ``to_dict`` layout given by ``trie``, other than the values of the fields.
+
+	:param trie:
+	:param texts: The text before each field, which is extended in place.
+		The last element is the text after the last field.
+	:param template_fields: The fields, in order, which is extended in place.
+	"""
+
+	def add(child: Union[_FieldSpec, _PathTrie, None]) -> None:
+		if child is None:
+			texts[-1] += "null"
+		elif isinstance(child, _FieldSpec):
+			template_fields.append(child)
+			texts.append('')
+		else:
+			_json_template(child, texts, template_fields)
+
+	if _is_list_node(trie):
+		texts[-1] += '['
+		for index in range(max(trie) + 1):
+			if index:
+				texts[-1] += ','
+			add(trie.get(index))
+		texts[-1] += ']'
+
+	else:
+		texts[-1] += '{'
+		for idx, (key, child) in enumerate(trie.items()):
+			# The stdlib encoder determines how non-string keys (e.g. integers) are written.
+			texts[-1] += f"{',' if idx else ''}{_json_encode({key: None})[1:-len(':null}')]}:"
+			add(child)
+		texts[-1] += '}'
+
+
+def _selector_key(selectors: Optional[Iterable[_Selector]]) -> Optional[Tuple[_Selector, ...]]:
+	"""
+	Returns the ``include`` or ``exclude`` argument to ``to_dict`` as a hashable tuple of selectors.
+
+	:param selectors:
+	"""
+
+	if selectors is None:
+		return None
+	elif isinstance(selectors, str):
+		return (selectors, )
+	else:
+		return tuple(s if isinstance(s, str) else tuple(s) for s in selectors)
+
+
+def _cache_bounded(cache: Dict[Any, Any], key: Any, value: Any, maxsize: int = _PROJECTION_CACHE_SIZE) -> None:
+	"""
+	Add ``value`` to ``cache``, first discarding the oldest entry if the cache is full.
+
+	:param cache:
+	:param key:
+	:param value:
+	:param maxsize:
+	"""
+
+	if len(cache) >= maxsize:
+		del cache[next(iter(cache))]
+	cache[key] = value
+
+
+def _literal(key: Any, namespace: Dict[str, Any]) -> str:
+	"""
+	Returns Python source for the given dictionary key.
+
+	Strings and integers are written as literals; any other keys are bound in ``namespace``.
+
+	:param key:
+	:param namespace: The globals for the generated function.
+	"""
+
+	if type(key) in {str, int, _Index}:
+		return repr(key)
+
+	name = f"_key{len(namespace)}"
+	namespace[name] = key
+	return name
+
+
+def _subscript(target: str, path: Tuple[Any, ...], namespace: Dict[str, Any]) -> str:
+	"""
+	Returns Python source which looks up ``path`` in ``target``.
+
+	:param target: The source for the outermost object.
+	:param path:
+	:param namespace: The globals for the generated function.
+	"""
+
+	return target + ''.join(f"[{_literal(key, namespace)}]" for key in path)
+
+
+def _import_numpy() -> Any:
+	try:
+		# 3rd party
+		import numpy  # nodep
+	except ImportError as e:  # pragma: no cover
+		exc = type(e)(f"Could not import 'numpy'. Perhaps you need to install 'attr_utils[numpy]'?\n\n{e}")
+		raise exc.with_traceback(e.__traceback__) from None
+
+	return numpy
+
+
+def _numpy_dtype(np: Any, tp: Any) -> Optional["numpy.dtype"]:
+	"""
+	Returns the NumPy dtype for the given field type,
+	or :py:obj:`None` if it cannot be stored in a structured array.
+
+	:param np: The :mod:`numpy` module.
+	:param tp: The field's type.
+	"""
+
+	if not isinstance(tp, type):
+		return None
+	elif issubclass(tp, bool):
+		return np.dtype(np.bool_)
+	elif issubclass(tp, int):
+		# Including IntEnum etc.
+		return np.dtype(np.int64)
+	elif issubclass(tp, float):
+		return np.dtype(np.float64)
+	elif issubclass(tp, complex):
+		return np.dtype(np.complex128)
+	elif issubclass(tp, np.generic) and not issubclass(tp, (np.str_, np.bytes_, np.object_)):
+		return np.dtype(tp)
+	else:
+		return None
+
+
+def _iter_trie(trie: _PathTrie, prefix: Tuple[Any, ...] = ()) -> Iterator[Tuple[Tuple[Any, ...], _FieldSpec]]:
+	"""
+	Returns an iterator over the paths and fields in ``trie``, in order.
+
+	:param trie:
+	:param prefix: The path to ``trie`` from the root.
+	"""
+
+	for key, child in trie.items():
+		if isinstance(child, _FieldSpec):
+			yield (*prefix, key), child
+		else:
+			yield from _iter_trie(child, (*prefix, key))
+
+
+def _trie_source(trie: _PathTrie, value: Callable[[_FieldSpec], str], namespace: Dict[str, Any]) -> str:
+	"""
+	Returns Python source for a dictionary display which constructs the nested dictionaries in ``trie``.
+
+	Each container is created exactly once, and filled in a single pass.
+
+	:param trie:
+	:param value: Function returning the source for the value of a field.
+	:param namespace: The globals for the generated function.
+	"""
+
+	if _is_list_node(trie):
+		# Any missing indexes are filled with None.
+		elements = ["None"] * (max(trie) + 1)
+		for index, child in trie.items():
+			if isinstance(child, _FieldSpec):
+				elements[index] = value(child)
+			else:
+				elements[index] = _trie_source(child, value, namespace)
+		return f"[{', '.join(elements)}]"
+
+	items = []
+
+	for key, child in trie.items():
+		if isinstance(child, _FieldSpec):
+			items.append(f"{_literal(key, namespace)}: {value(child)}")
+		else:
+			items.append(f"{_literal(key, namespace)}: {_trie_source(child, value, namespace)}")
+
+	return f"{{{', '.join(items)}}}"
+
+
+def _removed_paths(previous: Mapping[Any, Any], trie: _PathTrie, prefix: Tuple[Any, ...] = ()) -> List[Tuple[Any, ...]]:
+	"""
+	Returns the paths in ``previous`` which are not part of the layout given by ``trie``.
+
+	:param previous: An earlier ``to_dict`` output.
+	:param trie:
+	:param prefix: The path to ``previous`` and ``trie`` from the top level.
+	"""
+
+	removed = []
+
+	for key, value in previous.items():
+		child = trie.get(key)
+		if child is None:
+			removed.append((*prefix, key))
+		elif isinstance(child, dict) and isinstance(value, Mapping):
+			removed.extend(_removed_paths(value, child, (*prefix, key)))
+
+	return removed
+
+
+def _make_function(name: str, lines: List[str], namespace: Dict[str, Any], cls: Type) -> Callable:
+	"""
+	Compile the generated source for a function, and return the function.
+
+	The source is registered with :mod:`linecache` so it appears in tracebacks.
+
+	:param name: The name of the function.
+	:param lines: The lines of source code.
+	:param namespace: The globals for the function.
+	:param cls: The class the function is being generated for.
+	"""
+
+	source = '\n'.join(lines) + '\n'
+	filename = f"<attr_utils.serialise generated {name} {cls.__module__}.{cls.__qualname__}>"
+	exec(compile(source, filename, "exec"), namespace)  # pylint: disable=exec-used
+	linecache.cache[filename] = (len(source), None, source.splitlines(True), filename)
+	return namespace[name]
+
+
+def _find_plan(cls: Type) -> Optional[_SerdePlan]:
+	"""
+	Returns the plan for ``cls``, compiling it if required, or :py:obj:`None` if it is not a :deco:`~.serde` class.
+
+	Undecorated subclasses of serde classes use the metadata keys of their nearest decorated base class.
+
+	:param cls:
+	"""
+
+	try:
+		return _plans[cls]
+	except KeyError:
+		pass
+
+	for base in cls.__mro__[1:]:
+		if base in _plans:
+			parent = _plans[base]
+			break
+	else:
+		return None
+
+	plan = _plans[cls] = _SerdePlan(cls, parent.from_key, parent.to_key, parent=parent)
+	return plan
+
+
+def _get_plan(cls: Type[AttrsClass]) -> _SerdePlan:
+	"""
+	Returns the plan for ``cls``, compiling it if required.
+
+	:param cls:
+
+	:raises TypeError: If ``cls`` is not a :deco:`~.serde` class.
+	"""
+
+	plan = _find_plan(cls)
+
+	if plan is None:
+		raise TypeError(f"{cls.__qualname__!r} is not a serde class.")
+
+	return plan
+
+
+def _resolve_field_types(cls: Type[AttrsClass]) -> Dict[str, Any]:
+	"""
+	Returns the types of the fields of ``cls``, with forward references resolved where possible.
+
+	:param cls:
+	"""
+
+	localns = {cls.__name__: cls}
+
+	try:
+		return get_type_hints(cls, localns=localns)
+	except (NameError, TypeError, AttributeError):
+		pass
+
+	# Resolve each field individually, skipping those which can't be resolved.
+	module = sys.modules.get(cls.__module__)
+	globalns = vars(module) if module is not None else {}
+	field_types = {}
+
+	def holder() -> None:  # pragma: no cover
+		pass
+
+	for attribute in fields(cls):
+		holder.__annotations__ = {attribute.name: attribute.type}
+		try:
+			field_types.update(get_type_hints(holder, globalns=globalns, localns=localns))
+		except (NameError, TypeError, AttributeError):
+			continue
+
+	return field_types
+
+
+#: The ``on_setattr`` hooks of fields which ``update_from_dict`` can bypass,
+#: as it runs the field's converter and validator itself.
+_PLAIN_SETATTR_HOOKS = (None, setters.NO_OP, setters.convert, setters.validate)
+
+
+def _is_frozen(cls: Type) -> bool:
+	"""
+	Returns whether instances of the attrs class ``cls`` are frozen.
+
+	attrs doesn't expose this directly, so setting an attribute of an uninitialised instance
+	is checked for :exc:`attrs.exceptions.FrozenInstanceError`.
+
+	:param cls:
+	"""
+
+	probe = object.__new__(cls)
+	try:
+		probe.__setattr__("__attr_utils_frozen_probe__", None)
+	except FrozenInstanceError:
+		return True
+	except AttributeError:
+		# Slotted classes don't have an attribute by that name.
+		pass
+	return False
+
+
+def _is_serde_class(tp: Any) -> bool:
+	return isinstance(tp, type) and any(base in _plans for base in tp.__mro__)
+
+
+def _decoder_for(
+		tp: Any,
+		owner: Type,
+		scalars: bool = True,
+		unchecked: bool = False,
+		name: str = '',
+		) -> Optional[Callable[[Any], Any]]:
+	r"""
+	Returns a function to decode a value of the given type from its JSON-compatible form,
+	or :py:obj:`None` if no decoding is required.
+
+	Dictionaries are converted into :deco:`~.serde` classes, and (if ``scalars`` is :py:obj:`True`)
+	values are converted into enums, integers and floats. Lists, tuples, sets, dictionaries and
+	:py:data:`~typing.Optional`\s of these types are decoded recursively.
+
+	:param tp:
+	:param owner: The class the field belongs to, which may not yet be registered as a :deco:`~.serde` class.
+	:param scalars: Whether to decode enums, integers and floats.
+		This is disabled for fields with converters, which convert these values themselves.
+	:param unchecked: Whether to construct nested :deco:`~.serde` classes with ``from_dict_unchecked``.
+	:param name: The name of the field, used in the error raised for values which cannot be decoded without loss.
+	"""
+
+	if tp is owner or _is_serde_class(tp):
+		return _serde_decoder(tp, unchecked)
+
+	if scalars and isinstance(tp, type):
+		if issubclass(tp, enum.Enum) and issubclass(tp, int):
+			return partial(_decode_int_enum, tp, name)
+		elif tp is int:
+			return partial(_decode_int, name)
+		elif tp is float:
+			return partial(_decode_float, name)
+		elif issubclass(tp, enum.Enum):
+			return partial(_decode_enum, tp, name)
+
+	origin, args = get_origin(tp), get_args(tp)
+
+	if origin in _UNION_TYPES:
+		not_none = [arg for arg in args if arg is not type(None)]
+		if len(not_none) == 1:
+			# Optional
+			inner = _decoder_for(not_none[0], owner, scalars, unchecked, name)
+			if inner is not None:
+				return partial(_decode_optional, inner)
+
+	elif origin in _LIST_TYPES and args:
+		inner = _decoder_for(args[0], owner, scalars, unchecked, name)
+		if inner is not None:
+			return partial(_decode_list, inner)
+
+	elif origin in _SET_TYPES and args:
+		inner = _decoder_for(args[0], owner, scalars, unchecked, name)
+		if inner is not None:
+			return partial(_decode_set, frozenset if origin is frozenset else set, inner)
+
+	elif origin is tuple and len(args) == 2 and args[1] is Ellipsis:
+		inner = _decoder_for(args[0], owner, scalars, unchecked, name)
+		if inner is not None:
+			return partial(_decode_tuple, inner)
+
+	elif origin is tuple and args and args != ((), ):
+		inners = [_decoder_for(arg, owner, scalars, unchecked, name) for arg in args]
+		if any(inners):
+			return partial(_decode_fixed_tuple, tuple(inner or _identity for inner in inners))
+
+	elif origin in _DICT_TYPES and len(args) == 2:
+		key_decoder = _decoder_for(args[0], owner, scalars, unchecked, name)
+		value_decoder = _decoder_for(args[1], owner, scalars, unchecked, name)
+		if key_decoder is not None or value_decoder is not None:
+			return partial(_decode_dict, key_decoder or _identity, value_decoder or _identity)
+
+	return None
+
+
+def _decode_chunk(plan: _SerdePlan, dicts: Sequence[Mapping[str, Any]]) -> List[Any]:
+	"""
+	Construct instances from a chunk of dictionaries in a worker process.
+
+	:param plan:
+	:param dicts:
+	"""
+
+	return list(map(plan.from_dict, dicts))
+
+
+def _unpickle(cls: Type, *values: Any) -> Any:
+	"""
+	Restore an instance of a :deco:`~.serde` class pickled with ``compact_pickle``.
+
+	:param cls:
+	:param values: The values of the fields, in order.
+	"""
+
+	return _get_plan(cls).restore(*values)
+
+
+def _unpack_scalar(packer: struct.Struct, tp: Optional[Type], view: memoryview) -> Any:
+	value = packer.unpack(view)[0]
+	return value if tp is None else tp(value)
+
+
+def _decode_utf8(view: memoryview) -> str:
+	return str(view, "UTF-8")
+
+
+def _serde_to_bytes(obj: Any) -> bytes:
+	return _get_plan(type(obj)).to_bytes(obj)
+
+
+def _serde_from_bytes(tp: Type, view: memoryview) -> Any:
+	return _get_plan(tp).from_bytes(view)
+
+
+_json_encode = json.JSONEncoder(separators=(',', ':')).encode
+
+
+def _json_bytes(value: Any) -> bytes:
+	return _json_encode(_convert_value(value)).encode("UTF-8")
+
+
+def _json_from_bytes(decoder: Callable[[Any], Any], converter: Callable[[Any], Any], view: memoryview) -> Any:
+	return converter(decoder(json.loads(bytes(view))))
+
+
+def _lazy_property(field: _FieldSpec, decoder: Optional[Callable[[Any], Any]], cls: Type) -> Optional[property]:
+	"""
+	Returns a property which decodes the value of ``field`` from the source dictionary when it is first read,
+	and stores the result in the attribute's slot (or the instance dictionary).
+
+	Returns :py:obj:`None` for fields which aren't initialised from the dictionary and have no default.
+
+	:param field:
+	:param decoder: The function to decode the value, if any.
+	:param cls: The original class.
+	"""
+
+	attribute = field.attribute
+	default: Any = attribute.default
+
+	if not attribute.init and default is NOTHING:
+		return None
+
+	name = field.name
+	path = field.from_path
+	validator = attribute.validator
+	convert = field.convert
+
+	get_stored: Callable[[Any], Any]
+	store: Callable[[Any, Any], None]
+	slot = getattr(cls, name, None)
+	if isinstance(slot, types.MemberDescriptorType):
+		get_stored, store = slot.__get__, slot.__set__
+	else:
+
+		def get_stored(obj: Any) -> Any:
+			try:
+				return obj.__dict__[name]
+			except KeyError:
+				raise AttributeError(name) from None
+
+		def store(obj: Any, value: Any) -> None:
+			obj.__dict__[name] = value
+
+	def resolve(obj: Any) -> Any:
+		value: Any = _MISSING
+
+		if attribute.init:
+			value = obj._serde_source
+			try:
+				for key in path:
+					value = value[key]
+			except _LOOKUP_ERRORS:
+				value = _MISSING
+			else:
+				if decoder is not None:
+					value = decoder(value)
+
+		if value is _MISSING:
+			if isinstance(default, Factory):  # type: ignore[arg-type]
+				value = default.factory(obj) if default.takes_self else default.factory()
+			else:
+				# Matches ``from_dict``, which passes NOTHING to ``__init__``.
+				value = default
+
+		if value is not NOTHING:
+			value = convert(value, obj)
+
+			if validator is not None and not get_disabled():
+				validator(obj, attribute, value)
+
+		store(obj, value)
+		return value
+
+	def fget(obj: Any) -> Any:
+		try:
+			return get_stored(obj)
+		except AttributeError:
+			return resolve(obj)
+
+	return property(fget, store, doc=f"The {name!r} field, decoded when it is first accessed.")
+
+
+def _reduce_lazy(obj: Any) -> Tuple[Callable, Tuple[Any, ...]]:
+	"""
+	Pickle a lazy proxy as an instance of the original class, decoding any fields which haven't been read yet.
+
+	:param obj:
+	"""
+
+	cls = obj.__class__
+	state = {}
+	for attribute in fields(cls):
+		value = getattr(obj, attribute.name, _MISSING)
+		if value is not _MISSING:
+			state[attribute.name] = value
+
+	return _restore_instance, (cls, state)
+
+
+def _restore_instance(cls: Type, state: Dict[str, Any]) -> Any:
+	"""
+	Construct an instance of ``cls`` from the values of its attributes, without calling ``__init__``.
+
+	:param cls:
+	:param state: Mapping of attribute names to values.
+	"""
+
+	obj = object.__new__(cls)
+
+	for name, value in state.items():
+		object.__setattr__(obj, name, value)
+
+	hash_code = getattr(cls.__hash__, "__code__", None)
+	if hash_code is not None and "_attrs_cached_hash" in hash_code.co_names:
+		object.__setattr__(obj, "_attrs_cached_hash", None)
+
+	return obj
+
+
+def _identity(value: Any) -> Any:
+	return value
+
+
+def _invalid_scalar(tp: Type, name: str, value: Any) -> ValueError:
+	return ValueError(f"Cannot decode {value!r} as {tp.__qualname__} for field {name!r} without loss.")
+
+
+def _decode_int(name: str, value: Any) -> Any:
+	# Other integers (bools, IntEnum members and NumPy integers) are normalised to int, as are integral floats
+	# and numeric strings (including dictionary keys, which are always strings in JSON).
+	# Anything which would be truncated or coerced is rejected. None is left for the validators.
+	if type(value) is int or value is None:
+		return value
+	elif isinstance(value, numbers.Integral):
+		return int(value)
+	elif isinstance(value, numbers.Real):
+		try:
+			as_float = float(value)
+			if as_float.is_integer():
+				return int(as_float)
+		except (ValueError, OverflowError):
+			pass
+	elif isinstance(value, str):
+		try:
+			return int(value)
+		except ValueError:
+			pass
+	raise _invalid_scalar(int, name, value)
+
+
+def _decode_float(name: str, value: Any) -> Any:
+	if type(value) is float or value is None:
+		return value
+	elif isinstance(value, (numbers.Real, str)):
+		try:
+			return float(value)
+		except (ValueError, OverflowError):
+			pass
+	raise _invalid_scalar(float, name, value)
+
+
+def _decode_enum(tp: Type, name: str, value: Any) -> Any:
+	if type(value) is tp or value is None:
+		return value
+	try:
+		return tp(value)
+	except ValueError:
+		raise _invalid_scalar(tp, name, value) from None
+
+
+def _decode_int_enum(tp: Type, name: str, value: Any) -> Any:
+	if type(value) is tp or value is None:
+		return value
+	try:
+		return tp(_decode_int(name, value))
+	except ValueError:
+		raise _invalid_scalar(tp, name, value) from None
+
+
+def _decode_set(factory: Callable[[Iterable[Any]], Any], decoder: Callable[[Any], Any], value: Any) -> Any:
+	return factory(map(decoder, value))
+
+
+def _decode_fixed_tuple(decoders: Tuple[Callable[[Any], Any], ...], value: Any) -> Any:
+	return tuple(decoder(v) for decoder, v in zip(decoders, value))
+
+
+def _serde_decoder(tp: Type, unchecked: bool = False) -> Callable[[Any], Any]:
+	plan: Optional[_SerdePlan] = None
+
+	def decode(value: Any) -> Any:
+		nonlocal plan
+
+		if type(value) is not dict and not isinstance(value, Mapping):
+			# e.g. already an instance
+			return value
+
+		if plan is None:
+			plan = _get_plan(tp)
+
+		if unchecked:
+			return plan.from_dict_unchecked(value)
+		return plan.from_dict(value)
+
+	return decode
+
+
+def _decode_optional(decoder: Callable[[Any], Any], value: Any) -> Any:
+	return None if value is None else decoder(value)
+
+
+def _decode_list(decoder: Callable[[Any], Any], value: Any) -> Any:
+	return list(map(decoder, value))
+
+
+def _decode_tuple(decoder: Callable[[Any], Any], value: Any) -> Any:
+	return tuple(map(decoder, value))
+
+
+def _decode_dict(key_decoder: Callable[[Any], Any], value_decoder: Callable[[Any], Any], value: Any) -> Any:
+	return {key_decoder(k): value_decoder(v) for k, v in value.items()}
+
+
+def _convert_value(value: Any) -> Any:
+	"""
+	Convert a value into basic Python types, as :func:`attrs.asdict` does,
+	but using the ``to_dict`` layout of any nested :deco:`~.serde` classes.
+
+	:param value:
+	"""
+
+	value_type = type(value)
+
+	if value_type in _SCALAR_TYPES:
+		return value
+	elif hasattr(value_type, "__attrs_attrs__"):
+		plan = _find_plan(value_type)
+		if plan is not None:
+			return plan.to_dict_converted(value)
+		return {a.name: _convert_value(getattr(value, a.name)) for a in fields(value_type)}
+	elif isinstance(value, (tuple, list, set, frozenset)):
+		return list(map(_convert_value, value))
+	elif isinstance(value, dict):
+		return {k: _convert_value(v) for k, v in value.items()}
+	else:
+		return value
+
+
+@overload
+def serde(
+		cls: Type,
+		from_key: str = ...,
+		to_key: str = ...,
+		compact_pickle: bool = ...,
+		) -> Type[AttrsClass]: ...
+
+
+@overload
+def serde(
+		cls: None = None,
+		from_key: str = ...,
+		to_key: str = ...,
+		compact_pickle: bool = ...,
+		) -> Callable[[Type[AttrsClass]], Type[AttrsClass]]: ...
+
+
+def serde(  # noqa: PRM003
+		cls: Optional[Type[AttrsClass]] = None,
+		from_key: str = "from",
+		to_key: str = "to",
+		compact_pickle: bool = False,
+		) -> Union[Type[AttrsClass], Callable[[Type[AttrsClass]], Type[AttrsClass]]]:
+	r"""
+	Decorator to add serialisation and deserialisation capabilities to attrs classes.
+
+	The keys used in the dictionary output, and used when creating the class from a dictionary,
+	can be controlled using the ``metadata`` argument in :func:`attrs.field`:
+
+	.. code-block::
+
+		from attr_utils.serialize import serde
+		import attrs
+
+		@serde
+		@attrs.define
+		class Person(object):
+			name = attrs.field(metadata={"to": name_path, "from": name_path})
+			phone = attrs.field(metadata={"to": phone_path, "from": phone_path})
+
+	Paths can also be given as strings, with keys separated by ``.`` and list indexes in square brackets,
+	such as ``"contact.personal.name"`` or ``"items[0].id"``. These are parsed once when the class is decorated,
+	and an invalid path raises a :exc:`ValueError`. In the output of ``to_dict``, a level of the layout
+	whose keys are all list indexes is a list (with :py:obj:`None` for any indexes without a field).
+	Keys containing ``.``, ``[`` or ``]`` must be given in a list.
+
+	The names of the keys given in the ``metadata`` argument can be controlled with the
+	``from_key`` and ``to_key`` arguments:
+
+	.. code-block::
+
+		from attr_utils.serialize import serde
+		import attrs
+
+		@serde(from_key="get", to_key="set")
+		@attrs.define
+		class Person(object):
+			name = attrs.field(metadata={"get": name_path, "set": name_path})
+			phone = attrs.field(metadata={"get": phone_path, "set": phone_path})
+
+
+	This may be required when using other extensions to attrs.
+
+
+	:param cls: The attrs class to add the methods to.
+	:param from_key:
+	:param to_key:
+	:param compact_pickle: Install a ``__reduce_ex__`` method which pickles instances as a flat tuple
+		of their field values, and restores them without calling ``__init__``, converters or validators.
+		This gives smaller pickles which are quicker to load, such as when sending objects
+		to other processes with :mod:`concurrent.futures`.
+		Subclasses which add extra state outside of attrs fields should not use this.
+
+	:rtype:
+
+	.. versionchanged:: 1.2.0  Added the ``compact_pickle`` argument.
+
+	.. latex:vspace:: 20px
+
+	Classes decorated with :deco:`~attr_utils.serialise.serde` will have the following methods added:
+
+	* constructors: :meth:`from_dict`, :meth:`from_dict_lazy`, :meth:`from_dict_unchecked`,
+	  :meth:`from_json`, :meth:`from_jsons` and :meth:`from_bytes`;
+	* serialisers: :meth:`to_dict` (which also outputs projections, with ``include`` and ``exclude``),
+	  :meth:`to_json`, :meth:`iter_json`, :meth:`to_bytes` and :meth:`as_mapping`;
+	* partial updates: :meth:`update_from_dict` and :meth:`to_dict_delta`;
+	* bulk methods: :meth:`from_dicts`, :meth:`iter_from_dicts`, :meth:`to_dicts`, :meth:`iter_to_dicts`,
+	  :meth:`to_columns`, :meth:`from_columns`, :meth:`to_records` and :meth:`from_records`.
+
+	.. versionchanged:: 1.2.0
+
+		Previously only :meth:`from_dict` and :meth:`to_dict` were added.
+
+	.. py:classmethod:: from_dict(d)
+
+		Construct an instance of the class from a dictionary.
+
+		:param d: The dictionary.
+		:type d: :class:`~typing.Mapping`\[:class:`str`, :py:obj:`~typing.Any`\]
+
+		.. versionchanged:: 1.2.0
+
+			Fields missing from the dictionary which have a factory default now use that default,
+			rather than being set to the :class:`~attrs.Factory` object.
+
+		.. versionchanged:: 1.2.0
+
+			Dictionaries are converted into instances of other :deco:`~.serde` classes for fields annotated
+			with those classes, or with lists, tuples, dictionaries or :py:data:`~typing.Optional`\s of them.
+
+		.. versionchanged:: 1.2.0
+
+			Values for fields annotated with :class:`int`, :class:`float` or an :class:`enum.Enum`
+			(including inside containers, sets and dictionary keys) are converted to that type.
+			Other integers and floats (including :class:`bool`\s, :class:`enum.IntEnum` members and NumPy scalars),
+			integral floats and numeric strings are accepted and converted to the built-in type,
+			so for example ``True`` becomes ``1`` for an :class:`int` field. :py:obj:`None` is left unchanged,
+			but a :exc:`ValueError` naming the field is raised for values which cannot be converted without loss,
+			such as ``1.7`` for an :class:`int` field or ``10**400`` for a :class:`float` field.
+			Fields with a converter are left to the converter.
+
+		.. versionchanged:: 1.2.0
+
+			String values of fields with ``metadata={"intern": True}`` share a single copy of each distinct value
+			between all the instances constructed, which reduces memory usage for low-cardinality fields
+			such as names of categories. Up to 1024 distinct values are stored by default;
+			another limit can be given as the value of the ``intern`` key.
+
+	.. py:method:: to_dict(convert_values=False, *, include=None, exclude=None):
+
+		Returns a dictionary containing the contents of the class.
+
+		:param convert_values: Recurse into other attrs classes, and convert tuples, sets etc.
+			into lists. This may be required to later construct a new class from the
+			dictionary if the class uses complex converter functions.
+		:type convert_values: :class:`bool`
+		:param include: The fields to output. By default all fields are output.
+		:type include: :py:obj:`~typing.Optional`\[:class:`~typing.Iterable`\[:py:obj:`~typing.Union`\[:class:`str`, :class:`~typing.Sequence`\]\]\]
+		:param exclude: Fields to omit from the output.
+		:type exclude: :py:obj:`~typing.Optional`\[:class:`~typing.Iterable`\[:py:obj:`~typing.Union`\[:class:`str`, :class:`~typing.Sequence`\]\]\]
+
+		Fields are selected by attribute name, or by the first key (a string) or a prefix (a sequence of keys)
+		of their ``to`` path. For example, ``include=[("contact", "phone")]`` outputs only the fields
+		written under ``{"contact": {"phone": ...}}``.
+		A function is compiled for each distinct projection the first time it is used,
+		so the output is constructed as quickly as with all the fields.
+
+		:rtype: :class:`~typing.MutableMapping`\[:class:`str`, :py:obj:`~typing.Any`\]
+
+		.. versionchanged:: 0.5.0
+
+			By default values are left unchanged. In version 0.4.0 these were converted
+			to basic Python types, which may be undesirable. The original behaviour can be
+			restored using the ``convert_values`` parameter.
+
+		.. versionchanged:: 1.2.0
+
+			When ``convert_values`` is :py:obj:`True`, other :deco:`~.serde` classes
+			are converted using their own ``to_dict`` layout rather than with :func:`attrs.asdict`.
+
+		.. versionchanged:: 1.2.0  Added the ``include`` and ``exclude`` arguments.
+
+	.. py:classmethod:: from_dict_lazy(d)
+
+		Construct an instance of the class from a dictionary, deferring the work until the fields are used.
+
+		The instance keeps a reference to ``d``. The first time each field is read its value is looked up,
+		decoded, converted and validated as by :meth:`from_dict`, and the result is stored on the instance.
+		This is useful when only a few fields of most objects are needed, such as when filtering a stream of records.
+
+		The instance is of a proxy subclass of the class, but its ``__class__`` attribute is the class itself
+		so it compares equal to other instances. ``__attrs_post_init__`` is not called, and
+		errors from missing or invalid values are only raised when the field is accessed.
+		Pickling or copying the instance decodes all of its fields.
+
+		:param d: The dictionary.
+		:type d: :class:`~typing.Mapping`\[:class:`str`, :py:obj:`~typing.Any`\]
+
+		.. versionadded:: 1.2.0
+
+	.. py:method:: to_json()
+
+		Returns the JSON text for the instance.
+
+		The output is equivalent to ``json.dumps(obj.to_dict(convert_values=True), separators=(',', ':'))``,
+		but is written directly from the instance without constructing the dictionaries first.
+		The brackets and escaped keys of the ``to`` paths are rendered once for the class,
+		so only the values of the fields are encoded on each call.
+		Values other than strings, integers and :deco:`~.serde` classes are encoded by
+		the current :class:`~.JSONBackend` (see :func:`~.set_json_backend`).
+
+		:rtype: :class:`str`
+
+		.. versionadded:: 1.2.0
+
+	.. py:method:: iter_json()
+
+		As :meth:`to_json`, but returns an iterator over chunks of the JSON text.
+
+		Nested :deco:`~.serde` classes, including lists and tuples of them, are encoded incrementally,
+		so the text for large objects can be written to a file without holding all of it in memory.
+
+		:rtype: :class:`~typing.Iterator`\[:class:`str`\]
+
+		.. versionadded:: 1.2.0
+
+	.. py:classmethod:: from_json(data)
+
+		Construct an instance of the class from JSON text, such as the output of :meth:`to_json`.
+
+		The text is parsed by the ``loads`` function of the current :class:`~.JSONBackend`
+		(see :func:`~.set_json_backend`), and the instance is constructed as by :meth:`from_dict`.
+
+		:param data:
+		:type data: :class:`str` or :class:`bytes`
+
+		.. versionadded:: 1.2.0
+
+	.. py:classmethod:: from_jsons(documents)
+
+		Construct a list of instances of the class from an iterable of JSON documents,
+		such as messages from a queue.
+
+		:param documents:
+		:type documents: :class:`~typing.Iterable`\[:class:`str` or :class:`bytes`\]
+
+		:rtype: :class:`~typing.List`
+
+		.. versionadded:: 1.2.0
+
+	.. py:method:: to_bytes()
+
+		Returns a compact binary encoding of the instance.
+
+		The values of the fields which are arguments to ``__init__`` are stored by position, in declaration order,
+		behind a fingerprint of the class's fields. Non-optional :class:`bool`, :class:`int` and :class:`float`
+		fields are packed with :mod:`struct` (integers must fit in 64 bits), strings as UTF-8,
+		:class:`bytes`, :class:`bytearray` and :class:`memoryview` fields as is,
+		and other :deco:`~.serde` classes with their own encoding. Values of other types are stored
+		as JSON, in the same form as ``to_dict(convert_values=True)``, and the field's converter (if any)
+		is applied when they are decoded, so for example a field with ``converter=frozenset`` round-trips as a :class:`frozenset`.
+
+		The encoding is intended for caches and similar, and is not stable between versions of the class.
+
+		:rtype: :class:`bytes`
+
+		.. versionadded:: 1.2.0
+
+	.. py:classmethod:: from_bytes(data)
+
+		Construct an instance of the class from the output of :meth:`to_bytes`.
+
+		The data is trusted, so as with :meth:`from_dict_unchecked` validators are not run,
+		and converters are only run for fields stored as JSON (except for converters taking the instance or field).
+		Fields annotated as :class:`bytes`, :class:`bytearray` or :class:`memoryview` are returned as
+		:class:`memoryview` slices of ``data`` without copying, which keeps ``data`` alive.
+
+		:param data:
+		:type data: :class:`bytes`, :class:`bytearray` or :class:`memoryview`
+
+		:raises ValueError: If the data was encoded by a different class, or a different version of the class.
+
+		.. versionadded:: 1.2.0
+
+	.. py:method:: as_mapping()
+
+		Returns a read-only :class:`~.SerdeMapping` view of the instance, with the same layout as the output of :meth:`to_dict`.
+
+		Unlike :meth:`to_dict` no dictionaries are constructed; values and nested levels are looked up as they are accessed.
+		Use :func:`~.json_default` to serialise the view with :mod:`json`.
+
+		:rtype: :class:`~.SerdeMapping`
+
+		.. versionadded:: 1.2.0
+
+	.. py:classmethod:: from_dict_unchecked(d)
+
+		Construct an instance of the class from a trusted dictionary, such as one previously
+		returned by :meth:`to_dict`, without calling ``__init__``.
+
+		The attributes are set directly on the new instance (which also works for slotted and frozen classes).
+		Nested :deco:`~.serde` classes, enums, integers and floats are decoded as with :meth:`from_dict`,
+		but converters and validators are not run, so the values must already be of the types they would produce.
+		``__attrs_post_init__`` is still called.
+
+		:param d: The dictionary.
+		:type d: :class:`~typing.Mapping`\[:class:`str`, :py:obj:`~typing.Any`\]
+
+		.. versionadded:: 1.2.0
+
+	.. py:method:: update_from_dict(d)
+
+		Update the instance from a partial dictionary, in the same layout as is accepted by :meth:`from_dict`.
+
+		Only fields whose ``from`` paths are present in ``d`` are changed, and only their converters
+		and validators are run, each exactly once. Mutable instances are modified in place, and are returned.
+		The attributes are set directly rather than with :func:`setattr`, so ``on_setattr`` hooks are not run again.
+		Fields with ``on_setattr=attrs.setters.frozen`` raise :exc:`attrs.exceptions.FrozenAttributeError`,
+		and fields with other custom hooks raise :exc:`TypeError`, as what the hook does can't be determined.
+		For frozen classes a single new instance is created with the changes applied, and is returned.
+
+		Values for nested :deco:`~.serde` classes replace the existing value rather than being merged into it.
+
+		:param d: The partial dictionary.
+		:type d: :class:`~typing.Mapping`\[:class:`str`, :py:obj:`~typing.Any`\]
+
+		.. versionadded:: 1.2.0
+
+	.. py:method:: to_dict_delta(previous, convert_values=False)
+
+		Returns the changes between ``previous`` and this instance, in the layout of :meth:`to_dict`.
+
+		Each field is compared with its value in ``previous``, and only those which differ are included
+		in the returned dictionary. A second value lists the paths which were present in ``previous``
+		but are no longer part of the output, such as when ``previous`` is a snapshot from a different class.
+
+		.. code-block:: python
+
+			>>> changed, removed = person.to_dict_delta(previous_person)
+			>>> changed
+			{"contact": {"phone": "555-445566"}}
+
+		As only some of the values may have changed, levels which :meth:`to_dict` outputs as lists
+		(those given by list indexes in the ``to`` paths, such as ``"items[0]"``) are dictionaries
+		keyed by the indexes of the changed values. This distinguishes unchanged values from
+		values changed to :py:obj:`None`, which the placeholders in the lists would not.
+
+		:param previous: An earlier instance, or a dictionary previously returned by :meth:`to_dict`.
+		:param convert_values: As for :meth:`to_dict`. This should match the value used to create ``previous``
+			if it is a dictionary.
+		:type convert_values: :class:`bool`
+
+		:returns: A tuple of the changed values and a list of the removed paths.
+		:rtype: :class:`~typing.Tuple`\[:class:`~typing.MutableMapping`\[:class:`str`, :py:obj:`~typing.Any`\], :class:`~typing.List`\[:class:`~typing.Tuple`\]\]
+
+		.. versionadded:: 1.2.0
+
+	.. py:classmethod:: from_dicts(dicts, workers=None, chunk_size=None)
+
+		Construct a list of instances of the class from an iterable of dictionaries.
+
+		If ``workers`` is greater than 1 the dictionaries are split into chunks which are decoded
+		in a :class:`~concurrent.futures.ProcessPoolExecutor` with that many processes.
+		The instances are returned in the same order as the dictionaries.
+		This is only worthwhile for large numbers of dictionaries, as the dictionaries and instances
+		must be pickled to transfer them between processes (see the ``compact_pickle`` option).
+		The class must be importable by the worker processes.
+
+		:param dicts:
+		:type dicts: :class:`~typing.Iterable`\[:class:`~typing.Mapping`\[:class:`str`, :py:obj:`~typing.Any`\]\]
+		:param workers: The number of worker processes.
+		:type workers: :py:obj:`~typing.Optional`\[:class:`int`\]
+		:param chunk_size: The number of dictionaries sent to a worker process at a time.
+			By default the dictionaries are split into four chunks per worker.
+		:type chunk_size: :py:obj:`~typing.Optional`\[:class:`int`\]
+
+		.. versionadded:: 1.2.0
+
+	.. py:classmethod:: iter_from_dicts(dicts)
+
+		As :meth:`from_dicts`, but returns a lazy iterator.
+
+		:param dicts:
+		:type dicts: :class:`~typing.Iterable`\[:class:`~typing.Mapping`\[:class:`str`, :py:obj:`~typing.Any`\]\]
+
+		.. versionadded:: 1.2.0
+
+	.. py:classmethod:: to_dicts(objs, convert_values=False)
+
+		Returns a list of dictionaries containing the contents of the given instances.
+
+		The instances must all be of the class the method is called on
+		(not a subclass with additional fields).
+
+		:param objs:
+		:param convert_values: As for :meth:`to_dict`.
+		:type convert_values: :class:`bool`
+
+		:rtype: :class:`~typing.List`\[:class:`~typing.MutableMapping`\[:class:`str`, :py:obj:`~typing.Any`\]\]
+
+		.. versionadded:: 1.2.0
+
+	.. py:classmethod:: iter_to_dicts(objs, convert_values=False)
+
+		As :meth:`to_dicts`, but returns a lazy iterator.
+
+		:param objs:
+		:param convert_values: As for :meth:`to_dict`.
+		:type convert_values: :class:`bool`
+
+		:rtype: :class:`~typing.Iterator`\[:class:`~typing.MutableMapping`\[:class:`str`, :py:obj:`~typing.Any`\]\]
+
+		.. versionadded:: 1.2.0
+
+	.. py:classmethod:: to_columns(objs)
+
+		Returns the values of the fields of the given instances as columns.
+
+		Each key is the field's ``to`` path as a tuple (``(name, )`` for fields without one),
+		and each value is the list of the field's values for each object.
+
+		:param objs:
+
+		:rtype: :class:`~typing.Dict`\[:class:`~typing.Tuple`\[:py:obj:`~typing.Any`, ...\], :class:`~typing.List`\[:py:obj:`~typing.Any`\]\]
+
+		.. versionadded:: 1.2.0
+
+	.. py:classmethod:: from_columns(columns)
+
+		Construct a list of instances of the class from columns of values.
+
+		Each key is the field's ``from`` path as a tuple, so the output of :meth:`to_columns` is only accepted
+		for classes whose fields have the same ``from`` and ``to`` paths.
+		Fields without a column take their default value.
+		Each field's converter is applied to the whole column at once,
+		and the instances are then created without calling ``__init__`` again.
+		Validators and ``__attrs_post_init__`` are still run.
+
+		:param columns:
+		:type columns: :class:`~typing.Mapping`\[:class:`~typing.Tuple`\[:py:obj:`~typing.Any`, ...\], :class:`~typing.Sequence`\[:py:obj:`~typing.Any`\]\]
+
+		:raises ValueError: If the columns are of different lengths, or a key is not the ``from`` path of a field.
+
+		.. versionadded:: 1.2.0
+
+	.. py:classmethod:: to_records(objs)
+
+		Returns a NumPy structured array containing the values of the fields of the given instances.
+
+		The dtype is determined once for the class from the field types.
+		``bool``, ``int`` (including :class:`enum.IntEnum`), ``float``, ``complex``
+		and NumPy scalar types are supported. The dtype of other fields,
+		such as the width of ``str`` and ``bytes`` fields, must be given with the ``dtype`` metadata key
+		(e.g. ``attrs.field(metadata={"dtype": "U16"})``). Longer strings are truncated.
+
+		:param objs:
+
+		:rtype: :class:`numpy.ndarray`
+
+		.. extras-require:: numpy
+			:pyproject:
+
+		.. versionadded:: 1.2.0
+
+	.. py:classmethod:: from_records(array)
+
+		Construct a list of instances of the class from a NumPy structured array, as returned by :meth:`to_records`.
+
+		Fields not in the array take their default value. As with :meth:`from_columns`,
+		converters are applied to each column at once.
+
+		:param array:
+		:type array: :class:`numpy.ndarray`
+
+		.. extras-require:: numpy
+			:pyproject:
+
+		.. versionadded:: 1.2.0
+
+	.. versionchanged:: 1.2.0
+
+		The ``from_dict`` and ``to_dict`` methods are compiled once for each class,
+		rather than reading the field metadata on every call.
+
+	"""
+
+	def serde_with_class(cls: Type[AttrsClass]) -> Type[AttrsClass]:
+		_plans.invalidate_subclasses(cls)
+		plan = _plans[cls] = _SerdePlan(cls, from_key, to_key)
+
+		def get_plan(cls: Type[AttrsClass]) -> _SerdePlan:
+			if cls is plan.cls or cls is plan.lazy_cls:
+				return plan
+			return _get_plan(cls)
+
+		def from_dict(cls, d: Mapping[str, Any]):  # noqa: MAN002
+			return get_plan(cls).from_dict(d)
+
+		def to_dict(
+				self,
+				convert_values: bool = False,
+				*,
+				include: Optional[Iterable[Union[str, Sequence[Any]]]] = None,
+				exclude: Optional[Iterable[Union[str, Sequence[Any]]]] = None,
+				) -> MutableMapping[str, Any]:
+			if include is not None or exclude is not None:
+				return get_plan(type(self)).projection(include, exclude, convert_values)(self)
+			elif convert_values:
+				return get_plan(type(self)).to_dict_converted(self)
+			else:
+				return get_plan(type(self)).to_dict(self)
+
+		def update_from_dict(self, d: Mapping[str, Any]):  # noqa: MAN002
+			return get_plan(type(self)).update_from_dict(self, d)
+
+		def to_dict_delta(
+				self,
+				previous: Any,
+				convert_values: bool = False,
+				) -> Tuple[MutableMapping[str, Any], List[Tuple[Any, ...]]]:
+			return get_plan(type(self)).to_dict_delta(self, previous, convert_values)
+
+		def to_bytes(self) -> bytes:
+			return get_plan(type(self)).to_bytes(self)
+
+		def to_json(self) -> str:
+			return get_plan(type(self)).to_json(self)
+
+		def iter_json(self) -> Iterator[str]:
+			return get_plan(type(self)).iter_json(self)
+
+		def from_json(cls, data: Union[str, bytes]):  # noqa: MAN002
+			return get_plan(cls).from_json(data)
+
+		def from_jsons(cls, documents: Iterable[Union[str, bytes]]):  # noqa: MAN002
+			return get_plan(cls).from_jsons(documents)
+
+		def from_bytes(cls, data: Union[bytes, bytearray, memoryview]):  # noqa: MAN002
+			return get_plan(cls).from_bytes(data)
+
+		def from_dict_lazy(cls, d: Mapping[str, Any]):  # noqa: MAN002
+			return get_plan(cls).from_dict_lazy(d)
+
+		def as_mapping(self) -> SerdeMapping:
+			return SerdeMapping(self, get_plan(type(self)).to_trie)
+
+		def from_dict_unchecked(cls, d: Mapping[str, Any]):  # noqa: MAN002
+			return get_plan(cls).from_dict_unchecked(d)
+
+		def from_dicts(  # noqa: MAN002
+				cls,
+				dicts: Iterable[Mapping[str, Any]],
+				workers: Optional[int] = None,
+				chunk_size: Optional[int] = None,
+				):
+			return get_plan(cls).from_dicts(dicts, workers, chunk_size)
+
+		def iter_from_dicts(cls, dicts: Iterable[Mapping[str, Any]]):  # noqa: MAN002
+			return map(get_plan(cls).from_dict, dicts)
+
+		def to_dicts(cls, objs: Iterable[Any], convert_values: bool = False) -> List[MutableMapping[str, Any]]:
+			return list(iter_to_dicts(cls, objs, convert_values))
+
+		def iter_to_dicts(
+				cls,
+				objs: Iterable[Any],
+				convert_values: bool = False,
+				) -> Iterator[MutableMapping[str, Any]]:
+			cls_plan = get_plan(cls)
+
+			if convert_values:
+				return map(cls_plan.to_dict_converted, objs)
+			else:
+				return map(cls_plan.to_dict, objs)
+
+		def to_columns(cls, objs: Iterable[Any]) -> Dict[Tuple[Any, ...], List[Any]]:
+			return get_plan(cls).to_columns(objs)
+
+		def from_columns(cls, columns: Mapping[Tuple[Any, ...], Sequence[Any]]):  # noqa: MAN002
+			return get_plan(cls).from_columns(columns)
+
+		def to_records(cls, objs: Iterable[Any]) -> "numpy.ndarray":
+			return get_plan(cls).to_records(objs)
+
+		def from_records(cls, array: "numpy.ndarray"):  # noqa: MAN002
+			return get_plan(cls).from_records(array)
+
+		from_dict.__doc__ = f"""
+		Construct an instance of :class:`~.{cls.__name__}` from a dictionary.
+
+		:param d: The dictionary.
+		"""
+		from_dict.__qualname__ = f"{cls.__name__}.from_dict"
+		from_dict.__module__ = cls.__module__
+		cls.from_dict = classmethod(from_dict)
+
+		to_dict.__doc__ = f"""
+Returns a dictionary containing the contents of the :class:`~.{cls.__name__}` object.
+
+:param convert_values: Recursively convert values into dictionaries, lists etc. as appropriate.
+:param include: The attribute names or ``to`` path prefixes of the fields to output.
+:param exclude: The attribute names or ``to`` path prefixes of the fields to omit.
+"""
+		to_dict.__qualname__ = f"{cls.__name__}.to_dict"
+		to_dict.__module__ = cls.__module__
+		cls.to_dict = to_dict
+
+		def add_method(method: Callable, doc: str, is_classmethod: bool = True) -> None:
+			method.__doc__ = doc
+			method.__qualname__ = f"{cls.__name__}.{method.__name__}"
+			method.__module__ = cls.__module__
+			setattr(cls, method.__name__, classmethod(method) if is_classmethod else method)
+
+		add_method(
+				update_from_dict,
+				f"""
+		Update the :class:`~.{cls.__name__}` object with the fields present in the partial dictionary ``d``.
+
+		:param d:
+
+		:returns: The object, or a new object if the class is frozen.
+		""",
+				is_classmethod=False,
+				)
+
+		add_method(
+				to_dict_delta,
+				f"""
+		Returns the parts of the dictionary for the :class:`~.{cls.__name__}` object which differ from ``previous``,
+		and the paths in ``previous`` which have been removed.
+
+		:param previous: An earlier object, or a dictionary returned by its :meth:`~.{cls.__name__}.to_dict` method.
+		:param convert_values: Recursively convert values into dictionaries, lists etc. as appropriate.
+		""",
+				is_classmethod=False,
+				)
+
+		add_method(
+				to_json,
+				f"""
+		Returns the JSON text for the :class:`~.{cls.__name__}` object, without constructing a dictionary first.
+		""",
+				is_classmethod=False,
+				)
+
+		add_method(
+				iter_json,
+				f"""
+		Returns an iterator over chunks of the JSON text for the :class:`~.{cls.__name__}` object.
+		""",
+				is_classmethod=False,
+				)
+
+		add_method(
+				from_json,
+				f"""
+		Construct a :class:`~.{cls.__name__}` object from JSON text.
+
+		:param data:
+		""",
+				)
+
+		add_method(
+				from_jsons,
+				f"""
+		Construct a list of :class:`~.{cls.__name__}` objects from an iterable of JSON documents.
+
+		:param documents:
+		""",
+				)
+
+		add_method(
+				to_bytes,
+				f"""
+		Returns a compact binary encoding of the :class:`~.{cls.__name__}` object.
+		""",
+				is_classmethod=False,
+				)
+
+		add_method(
+				from_bytes,
+				f"""
+		Construct a :class:`~.{cls.__name__}` object from the output of :meth:`~.{cls.__name__}.to_bytes`.
+
+		:param data:
+		""",
+				)
+
+		add_method(
+				from_dict_lazy,
+				f"""
+		Construct a lazy :class:`~.{cls.__name__}` object from a dictionary,
+		which decodes the value of each field when it is first accessed.
+
+		:param d: The dictionary.
+		""",
+				)
+
+		add_method(
+				as_mapping,
+				f"""
+		Returns a read-only view of the :class:`~.{cls.__name__}` object,
+		with the same layout as the output of :meth:`~.{cls.__name__}.to_dict`.
+		""",
+				is_classmethod=False,
+				)
+
+		add_method(
+				from_dict_unchecked,
+				f"""
+		Construct an instance of :class:`~.{cls.__name__}` from a trusted dictionary,
+		without calling ``__init__``, converters or validators.
+
+		:param d: The dictionary.
+		""",
+				)
+
+		add_method(
+				from_dicts,
+				f"""
+		Construct a list of :class:`~.{cls.__name__}` objects from an iterable of dictionaries.
+
+		:param dicts:
+		""",
+				)
+
+		add_method(
+				iter_from_dicts,
+				f"""
+		Lazily construct :class:`~.{cls.__name__}` objects from an iterable of dictionaries.
+
+		:param dicts:
+		""",
+				)
+
+		add_method(
+				to_dicts,
+				f"""
+		Returns a list of dictionaries containing the contents of the given :class:`~.{cls.__name__}` objects.
+
+		:param objs:
+		:param convert_values: Recursively convert values into dictionaries, lists etc. as appropriate.
+		""",
+				)
+
+		add_method(
+				iter_to_dicts,
+				f"""
+		Lazily convert the given :class:`~.{cls.__name__}` objects into dictionaries.
+
+		:param objs:
+		:param convert_values: Recursively convert values into dictionaries, lists etc. as appropriate.
+		""",
+				)
+
+		add_method(
+				to_columns,
+				f"""
+		Returns the values of the fields of the given :class:`~.{cls.__name__}` objects as columns.
+
+		:param objs:
+
+		:returns: A mapping of each field's ``to`` path (as a tuple) to the list of its values.
+		""",
+				)
+
+		add_method(
+				from_columns,
+				f"""
+		Construct a list of :class:`~.{cls.__name__}` objects from columns of values.
+
+		:param columns: A mapping of each field's ``from`` path (as a tuple) to the list of its values.
+		""",
+				)
+
+		add_method(
+				to_records,
+				f"""
+		Returns a NumPy structured array containing the values of the fields of the given :class:`~.{cls.__name__}` objects.
+
+		:param objs:
+		""",
+				)
+
+		add_method(
+				from_records,
+				f"""
+		Construct a list of :class:`~.{cls.__name__}` objects from a NumPy structured array.
+
+		:param array:
+		""",
+				)
+
+		if compact_pickle:
+
+			def __reduce_ex__(self, protocol: int) -> Tuple[Any, ...]:
+				return get_plan(type(self)).reduce(self)
+
+			__reduce_ex__.__qualname__ = f"{cls.__name__}.__reduce_ex__"
+			__reduce_ex__.__module__ = cls.__module__
+			cls.__reduce_ex__ = __reduce_ex__  # type: ignore[assignment]
+
+		return cls
+
+	if cls is not None:
+		return serde_with_class(cls)
+	else:
+		return serde_with_class
+
+
+class SerdeMapping(collections.abc.Mapping):
+	"""
+	A read-only :class:`~typing.Mapping` view of a :deco:`~.serde` class instance,
+	with the same layout as the output of its ``to_dict`` method.
+
+	Nothing is copied: values are read from the instance when they are accessed,
+	and nested levels of the layout are themselves views which are created on access.
+
+	Instances are returned by the ``as_mapping`` method of :deco:`~.serde` classes.
+	They can be serialised by :mod:`json` using :func:`~.json_default`.
+
+	:param obj: The instance.
+	:param trie: The part of the ``to`` path layout this view represents.
+
+	.. versionadded:: 1.2.0
+	"""
+
+	__slots__ = ("_obj", "_trie")
+
+	def __init__(self, obj: Any, trie: _PathTrie):
+		self._obj = obj
+		self._trie = trie
+
+	def __getitem__(self, key: Any) -> Any:
+		child = self._trie[key]
+		if isinstance(child, _FieldSpec):
+			return getattr(self._obj, child.name)
+		elif _is_list_node(child):
+			elements = [None] * (max(child) + 1)
+			for index in child:
+				elements[index] = SerdeMapping(self._obj, child)[index]
+			return elements
+		return SerdeMapping(self._obj, child)
+
+	def __iter__(self) -> Iterator[Any]:
+		return iter(self._trie)
+
+	def __len__(self) -> int:
+		return len(self._trie)
+
+	def __contains__(self, key: object) -> bool:
+		return key in self._trie
+
+	def __repr__(self) -> str:
+		return f"{type(self).__name__}({dict(self)!r})"
+
+
+def json_default(obj: Any) -> Any:
+	"""
+	Function for the ``default`` argument of :func:`json.dumps` and :class:`json.JSONEncoder`,
+	which serialises :class:`~.SerdeMapping` views and :deco:`~.serde` class instances.
+
+	.. code-block:: python
+
+		>>> json.dumps(person.as_mapping(), default=json_default)
+		'{"contact": {"personal": {"name": "John"}, "phone": "555-112233"}}'
+
+	Nested views are expanded one level at a time as the encoder reaches them.
+
+	:param obj:
+
+	.. versionadded:: 1.2.0
+	"""
+
+	if isinstance(obj, SerdeMapping):
+		return dict(obj)
+
+	plan = _find_plan(type(obj))
+	if plan is not None:
+		return SerdeMapping(obj, plan.to_trie)
+
+	raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+class JSONBackend:
+	"""
+	The functions used by :deco:`~.serde` classes to encode and decode JSON.
+
+	Strings, integers and the layout of :deco:`~.serde` classes are always encoded by ``to_json``
+	and ``iter_json`` themselves; ``dumps`` is called for other values, once converted into
+	basic Python types as with ``to_dict(convert_values=True)``.
+
+	:param dumps: Function returning the JSON text for a value.
+	:param loads: Function to parse JSON text given as :class:`str` or :class:`bytes`.
+
+	.. versionadded:: 1.2.0
+	"""
+
+	__slots__ = ("dumps", "loads")
+
+	def __init__(
+			self,
+			dumps: Callable[[Any], str],
+			loads: Callable[[Union[str, bytes]], Any],
+			):
+		self.dumps = dumps
+		self.loads = loads
+
+	def __repr__(self) -> str:
+		return f"{type(self).__name__}(dumps={self.dumps!r}, loads={self.loads!r})"
+
+
+def _orjson_backend() -> JSONBackend:
+	try:
+		# 3rd party
+		import orjson  # nodep
+	except ImportError as e:  # pragma: no cover
+		exc = type(e)(f"Could not import 'orjson'. Perhaps you need to install 'attr_utils[orjson]'?\n\n{e}")
+		raise exc.with_traceback(e.__traceback__) from None
+
+	def dumps(value: Any) -> str:
+		return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS).decode("UTF-8")
+
+	return JSONBackend(dumps, orjson.loads)
+
+
+#: The backend used by default, which uses the :mod:`json` module from the standard library.
+_JSON_STDLIB_BACKEND = JSONBackend(_json_encode, json.loads)
+
+#: The current backend, set with :func:`~.set_json_backend`.
+_json_backend = _JSON_STDLIB_BACKEND
+
+
+def set_json_backend(backend: Union[str, JSONBackend]) -> JSONBackend:
+	"""
+	Set the library used by the ``to_json`` and ``iter_json`` methods of :deco:`~.serde` classes.
+
+	.. code-block:: python
+
+		>>> set_json_backend("orjson")
+
+	:param backend: ``'json'`` for the :mod:`json` module from the standard library (the default),
+		``'orjson'`` for `orjson <https://github.com/ijl/orjson>`_, or a custom :class:`~.JSONBackend`.
+
+	:returns: The previous backend, so it can be restored later.
+
+	.. versionadded:: 1.2.0
+	"""
+
+	global _json_backend
+
+	if backend == "json":
+		backend = _JSON_STDLIB_BACKEND
+	elif backend == "orjson":
+		backend = _orjson_backend()
+	elif not isinstance(backend, JSONBackend):
+		raise ValueError(f"Unknown JSON backend {backend!r}")
+
+	previous, _json_backend = _json_backend, backend
+	return previous
+
+
+#: Encodes a string as JSON, as the :mod:`json` module does by default.
+_encode_json_str: Callable[[str], str] = json.encoder.encode_basestring_ascii
+
+
+def _json_value(value: Any) -> str:
+	"""
+	Returns the JSON text for a value, as it is converted by ``to_dict(convert_values=True)``.
+
+	:param value:
+	"""
+
+	value_type = type(value)
+
+	if value_type is str:
+		return _encode_json_str(value)
+	elif value_type is int:
+		return int.__repr__(value)
+	elif value is None:
+		return "null"
+	elif value is True:
+		return "true"
+	elif value is False:
+		return "false"
+	elif value_type is float and isfinite(value):
+		return float.__repr__(value)
+	elif isinstance(value, int):
+		# Including IntEnum, which are written as their values.
+		return int.__repr__(value)
+	elif isinstance(value, str):
+		return _encode_json_str(value)
+	elif hasattr(value_type, "__attrs_attrs__"):
+		plan = _find_plan(value_type)
+		if plan is not None:
+			return plan.to_json(value)
+	elif value_type in {list, tuple} and value and hasattr(type(value[0]), "__attrs_attrs__"):
+		return f"[{','.join(map(_json_value, value))}]"
+
+	return _json_backend.dumps(_convert_value(value))
+
+
+def _iter_json_value(prefix: str, value: Any) -> Iterator[str]:
+	"""
+	Returns an iterator over chunks of the JSON text for a value, preceded by ``prefix``.
+
+	Nested :deco:`~.serde` classes, and lists and tuples of them, are encoded incrementally.
+
+	:param prefix:
+	:param value:
+	"""
+
+	value_type = type(value)
+
+	if hasattr(value_type, "__attrs_attrs__"):
+		plan = _find_plan(value_type)
+		if plan is not None:
+			yield prefix
+			yield from plan.iter_json(value)
+			return
+
+	elif value_type in {list, tuple} and value and hasattr(type(value[0]), "__attrs_attrs__"):
+		yield prefix + '['
+		separator = ''
+		for element in value:
+			plan = _find_plan(type(element))
+			if plan is None:
+				yield separator + _json_value(element)
+			else:
+				yield separator
+				yield from plan.iter_json(element)
+			separator = ','
+		yield ']'
+		return
+
+	yield prefix + _json_value(value)
+
+
+#: Magic numbers identifying the compressed formats read by :func:`load_jsonl`.
+_COMPRESSION_MAGIC = (
+		(b"\x1f\x8b", "gzip"),
+		(b"BZh", "bz2"),
+		(b"\xfd7zXZ\x00", "lzma"),
+		)
+
+#: Mapping of file suffixes to the compressed formats written by :func:`dump_jsonl`.
+_COMPRESSION_SUFFIXES = {".gz": "gzip", ".bz2": "bz2", ".xz": "lzma", ".lzma": "lzma"}
+
+
+def _open_compressed(fileobj: IO[bytes], compression: Optional[str], mode: Literal["rb", "wb"]) -> IO[bytes]:
+	"""
+	Wrap ``fileobj`` to (de)compress data with the given algorithm.
+
+	Closing the returned object does not close ``fileobj``.
+
+	:param fileobj: A file object opened in binary mode.
+	:param compression: One of ``'gzip'``, ``'bz2'`` or ``'lzma'``, or :py:obj:`None` for no compression.
+	:param mode: ``'rb'`` or ``'wb'``.
+	"""
+
+	if compression is None:
+		return fileobj
+	elif compression == "gzip":
+		return gzip.GzipFile(fileobj=fileobj, mode=mode)  # type: ignore[return-value]
+	elif compression == "bz2":
+		return bz2.BZ2File(fileobj, mode=mode)
+	elif compression == "lzma":
+		return lzma.LZMAFile(fileobj, mode=mode)
+	else:
+		raise ValueError(f"Unknown compression {compression!r}")
+
+
+def _sniff_compression(fileobj: IO[bytes]) -> Tuple[IO[bytes], Optional[str]]:
+	"""
+	Determine the compression used for the data in ``fileobj`` without consuming it.
+
+	:param fileobj: A file object opened for reading in binary mode.
+
+	:returns: The file object to read from (which may be a buffered wrapper around ``fileobj``)
+		and the name of the compression algorithm.
+	"""
+
+	if hasattr(fileobj, "peek"):
+		head = fileobj.peek(6)[:6]
+	elif fileobj.seekable():
+		position = fileobj.tell()
+		head = fileobj.read(6)
+		fileobj.seek(position)
+	else:
+		fileobj = io.BufferedReader(cast(io.RawIOBase, fileobj))
+		head = fileobj.peek(6)[:6]
+
+	for magic, compression in _COMPRESSION_MAGIC:
+		if head.startswith(magic):
+			return fileobj, compression
+
+	return fileobj, None
+
+
+def _iter_jsonl(from_dict: Callable[[Mapping[str, Any]], _C], fileobj: IO) -> Iterator[_C]:
+	"""
+	Construct objects from each line of a JSON Lines file object.
+
+	:param from_dict:
+	:param fileobj: A file object opened for reading in text or binary mode.
+	"""
+
+	if isinstance(fileobj, io.TextIOBase):
+		buffered = stream = fileobj
+	else:
+		buffered, compression = _sniff_compression(fileobj)
+		stream = _open_compressed(buffered, compression, mode="rb")
+
+	try:
+		loads = json.loads
+		for line in stream:
+			if line.strip():
+				yield from_dict(loads(line))
+	finally:
+		if stream is not buffered:
+			stream.close()
+		if buffered is not fileobj:
+			# Closing the buffered wrapper would also close the caller's stream.
+			cast(io.BufferedReader, buffered).detach()
+
+
+def _load_jsonl_file(from_dict: Callable[[Mapping[str, Any]], _C], filename: PathLike) -> Iterator[_C]:
+	with open(filename, "rb") as fp:
+		yield from _iter_jsonl(from_dict, fp)
+
+
+def load_jsonl(cls: Type[_C], fileobj: Union[PathLike, IO]) -> Iterator[_C]:
+	"""
+	Lazily construct instances of a :deco:`~.serde` class from a `JSON Lines <https://jsonlines.org/>`_ file.
+
+	The file is read one line at a time, so memory usage does not depend on the size of the file.
+	gzip, bz2 and xz compressed data is detected and decompressed transparently.
+
+	:param cls: The :deco:`~.serde` class.
+	:param fileobj: The filename, or a file object opened for reading in text or binary mode.
+		Compressed data can only be detected when the file is opened in binary mode.
+
+	.. versionadded:: 1.2.0
+	"""
+
+	from_dict = _get_plan(cls).from_dict
+
+	if isinstance(fileobj, (str, os.PathLike)):
+		return _load_jsonl_file(from_dict, fileobj)
+	else:
+		return _iter_jsonl(from_dict, fileobj)
+
+
+def dump_jsonl(
+		objs: Iterable[AttrsClass],
+		fileobj: Union[PathLike, IO],
+		*,
+		convert_values: bool = False,
+		compression: Optional[str] = None,
+		batch_size: int = 1000,
+		default: Optional[Callable[[Any], Any]] = None,
+		) -> int:
+	"""
+	Write instances of :deco:`~.serde` classes to a `JSON Lines <https://jsonlines.org/>`_ file.
+
+	The objects are written in batches of ``batch_size`` records at a time,
+	so memory usage does not depend on the number of objects.
+
+	:param objs: The objects to write. This may be a lazy iterator.
+	:param fileobj: The filename, or a file object opened for writing in text or binary mode.
+	:param convert_values: Passed to each object's ``to_dict`` method.
+	:param compression: The compression to apply to the data.
+		One of ``'gzip'``, ``'bz2'`` or ``'lzma'``, or :py:obj:`None` for no compression.
+		If ``fileobj`` is a filename this is determined from its suffix by default.
+		Compression cannot be used with files opened in text mode.
+	:param batch_size: The number of records to write to the file at once.
+	:param default: Function called to serialise objects which are not natively supported by :mod:`json`.
+
+	:returns: The number of records written.
+
+	.. versionadded:: 1.2.0
+	"""
+
+	if isinstance(fileobj, (str, os.PathLike)):
+		if compression is None:
+			compression = _COMPRESSION_SUFFIXES.get(os.path.splitext(fileobj)[1].lower())
+
+		with open(fileobj, "wb") as fp:
+			return dump_jsonl(
+					objs,
+					fp,
+					convert_values=convert_values,
+					compression=compression,
+					batch_size=batch_size,
+					default=default,
+					)
+
+	if isinstance(fileobj, io.TextIOBase):
+		if compression is not None:
+			raise ValueError("Compression cannot be used with a file opened in text mode.")
+
+		stream = fileobj
+
+		def write(lines: List[str]) -> None:
+			stream.write(''.join(lines))
+
+	else:
+		stream = _open_compressed(fileobj, compression, mode="wb")
+
+		def write(lines: List[str]) -> None:
+			stream.write(''.join(lines).encode("UTF-8"))
+
+	encode = json.JSONEncoder(separators=(',', ':'), default=default).encode
+	count = 0
+	batch: List[str] = []
+	obj_type, to_dict = None, None
+
+	try:
+		for obj in objs:
+			if type(obj) is not obj_type:
+				obj_type = type(obj)
+				plan = _get_plan(obj_type)
+				to_dict = plan.to_dict_converted if convert_values else plan.to_dict
+
+			batch.append(encode(to_dict(obj)))  # type: ignore[misc]
+			batch.append('\n')
+
+			if len(batch) >= batch_size * 2:
+				write(batch)
+				count += batch_size
+				batch.clear()
+
+		if batch:
+			write(batch)
+			count += len(batch) // 2
+
+	finally:
+		if stream is not fileobj:
+			stream.close()
+
+	return count
+
+
+#: Bytes which JSON treats as whitespace.
+_JSON_WHITESPACE = frozenset(b" \t\r\n")
+
+#: The header of the index files written by :class:`~.RecordFile`:
+#: a magic number, and the size and modification time of the data file.
+_INDEX_HEADER = struct.Struct("<8sQQ")
+_INDEX_MAGIC = b"JSONLIDX"
+
+
+def _index_lines(data: Any, start: int = 0, end: Optional[int] = None) -> "array[int]":
+	"""
+	Returns the offsets of the start of each non-blank line in ``data``.
+
+	:param data: A :class:`bytes` or :class:`mmap.mmap` object.
+	:param start: The offset to start searching from, which must be at the start of a line.
+	:param end: The offset to stop searching at. Defaults to the end of ``data``.
+	"""
+
+	if end is None:
+		end = len(data)
+
+	offsets = array('q')
+	append, find = offsets.append, data.find
+	position = start
+
+	while position < end:
+		newline = find(b"\n", position, end)
+		if newline < 0:
+			newline = end
+
+		# Only lines starting with whitespace need to be checked for being blank.
+		if newline > position and (data[position] not in _JSON_WHITESPACE or data[position:newline].strip()):
+			append(position)
+
+		position = newline + 1
+
+	return offsets
+
+
+def _split_byte_ranges(data: Any, chunk_size: int) -> List[Tuple[int, int]]:
+	"""
+	Split ``data`` into ranges of about ``chunk_size`` bytes, each ending at the end of a line.
+
+	:param data: A :class:`bytes` or :class:`mmap.mmap` object.
+	:param chunk_size:
+	"""
+
+	size = len(data)
+	ranges = []
+	start = 0
+
+	while start < size:
+		end = start + max(chunk_size, 1)
+		if end < size:
+			newline = data.find(b"\n", end - 1)
+			end = size if newline < 0 else newline + 1
+		else:
+			end = size
+
+		ranges.append((start, end))
+		start = end
+
+	return ranges
+
+
+def _decode_byte_range(plan: _SerdePlan, filename: PathLike, start: int, end: int) -> List[Any]:
+	"""
+	Construct instances from the lines of a JSON Lines file between ``start`` and ``end``, in a worker process.
+
+	Only that part of the file is mapped into memory.
+
+	:param plan:
+	:param filename:
+	:param start:
+	:param end:
+	"""
+
+	# The offset of a mapping must be a multiple of the allocation granularity.
+	offset = start - start % mmap.ALLOCATIONGRANULARITY
+
+	with open(filename, "rb") as fp:
+		with mmap.mmap(fp.fileno(), end - offset, access=mmap.ACCESS_READ, offset=offset) as data:
+			lines = data[start - offset:end - offset].split(b"\n")
+
+	from_json = plan.from_json
+	return [from_json(line) for line in lines if line and not line.isspace()]
+
+
+def load_jsonl_parallel(
+		cls: Type[_C],
+		filename: PathLike,
+		*,
+		workers: Optional[int] = None,
+		chunk_size: int = 64 * 1024 * 1024,
+		ordered: bool = True,
+		) -> Iterator[_C]:
+	"""
+	Construct instances of a :deco:`~.serde` class from a large `JSON Lines <https://jsonlines.org/>`_ file,
+	using several worker processes.
+
+	The file is split into ranges of about ``chunk_size`` bytes, aligned on the ends of lines.
+	Each worker process maps one range of the file into memory at a time, and decodes its lines with ``from_json``.
+	Only a few ranges per worker are decoded ahead of the returned iterator, which limits memory usage
+	if the instances are consumed more slowly than they are decoded.
+
+	The instances are sent back from the worker processes by :mod:`pickle`, and unpickling them in the
+	current process limits how much quicker this is than :func:`~.load_jsonl`.
+	The class must be importable by the worker processes (i.e. not defined in a function or in ``__main__``).
+
+	:param cls: The :deco:`~.serde` class.
+	:param filename: An uncompressed JSON Lines file. Blank lines are ignored.
+	:param workers: The number of worker processes. Defaults to the number of CPUs.
+		If ``1`` the file is decoded in the current process.
+	:param chunk_size: The approximate number of bytes in each range.
+	:param ordered: If :py:obj:`False` the instances from each range are returned as soon as it has been decoded,
+		rather than in the order they appear in the file.
+
+	.. versionadded:: 1.2.0
+	"""
+
+	plan = _get_plan(cls)
+
+	with open(filename, "rb") as fp:
+		if not os.fstat(fp.fileno()).st_size:
+			return iter(())
+
+		with mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ) as data:
+			for magic, compression in _COMPRESSION_MAGIC:
+				if data[:len(magic)] == magic:
+					raise ValueError(f"{compression} compressed files cannot be split. Use 'load_jsonl' instead.")
+
+			ranges = _split_byte_ranges(data, chunk_size)
+
+	if workers is None:
+		workers = os.cpu_count() or 1
+
+	if workers <= 1 or len(ranges) <= 1:
+		return chain.from_iterable(_decode_byte_range(plan, filename, start, end) for start, end in ranges)
+
+	return _iter_byte_ranges(plan, filename, ranges, min(workers, len(ranges)), ordered)
+
+
+def _iter_byte_ranges(
+		plan: _SerdePlan,
+		filename: PathLike,
+		ranges: List[Tuple[int, int]],
+		workers: int,
+		ordered: bool,
+		) -> Iterator[Any]:
+	"""
+	Decode the given ranges of a JSON Lines file in a pool of worker processes.
+
+	:param plan:
+	:param filename:
+	:param ranges:
+	:param workers:
+	:param ordered: Whether to return the instances in the order of the ranges, rather than as they are decoded.
+	"""
+
+	pending = iter(ranges)
+	futures: Deque[Future] = deque()
+
+	with ProcessPoolExecutor(max_workers=workers) as executor:
+
+		def submit() -> None:
+			byte_range = next(pending, None)
+			if byte_range is not None:
+				futures.append(executor.submit(_decode_byte_range, plan, filename, *byte_range))
+
+		try:
+			# Keep each worker busy, without decoding too far ahead.
+			for _ in range(workers * 2):
+				submit()
+
+			while futures:
+				if ordered:
+					future = futures.popleft()
+				else:
+					done, _ = wait(futures, return_when=FIRST_COMPLETED)
+					future = next(iter(done))
+					futures.remove(future)
+
+				objs = future.result()
+				submit()
+				yield from objs
+
+		finally:
+			# e.g. if the iterator isn't exhausted.
+			for future in futures:
+				future.cancel()
+
+
+class RecordFile(Sequence[_C]):
+	"""
+	A read-only sequence of the records in a `JSON Lines <https://jsonlines.org/>`_ file,
+	which are constructed on demand.
+
+	.. code-block:: python
+
+		with RecordFile(Device, "devices.jsonl") as devices:
+			page = devices[5000:5050]
+
+	The file is memory-mapped, and the position of each record is found when it is opened
+	(or read from ``index_file``). Indexing decodes only the requested records, using ``from_json``,
+	and the most recently used instances are cached, so the same instance is returned
+	while it remains in the cache.
+
+	:param cls: The :deco:`~.serde` class.
+	:param filename: An uncompressed JSON Lines file. Blank lines are ignored.
+	:param index_file: A file to store the positions of the records in, so they need not be found again
+		the next time the data file is opened. The index is rebuilt if the data file's size
+		or modification time has changed.
+	:param cache_size: The maximum number of instances to cache.
+
+	The data file must not be modified while it is open.
+
+	.. versionadded:: 1.2.0
+	"""
+
+	def __init__(
+			self,
+			cls: Type[_C],
+			filename: PathLike,
+			*,
+			index_file: Optional[PathLike] = None,
+			cache_size: int = 1024,
+			):
+		self.cls = cls
+		self.filename = filename
+		self.cache_size = cache_size
+
+		self._from_json = _get_plan(cls).from_json
+		self._cache: "OrderedDict[int, _C]" = OrderedDict()
+		self._data: Any = b''
+		self._file = open(filename, "rb")
+
+		try:
+			stat = os.fstat(self._file.fileno())
+
+			# Empty files can't be mapped.
+			if stat.st_size:
+				self._data = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+			for magic, compression in _COMPRESSION_MAGIC:
+				if self._data[:len(magic)] == magic:
+					raise ValueError(f"RecordFile cannot read {compression} compressed files.")
+
+			self._offsets = self._load_index(index_file, stat)
+
+		except BaseException:
+			self.close()
+			raise
+
+	def _load_index(self, index_file: Optional[PathLike], stat: os.stat_result) -> "array[int]":
+		"""
+		Read the offsets of the records from ``index_file`` if it is up to date, otherwise find them and write them.
+
+		:param index_file:
+		:param stat: The status of the data file.
+		"""
+
+		header = _INDEX_HEADER.pack(_INDEX_MAGIC, stat.st_size, stat.st_mtime_ns)
+
+		if index_file is not None and os.path.isfile(index_file):
+			with open(index_file, "rb") as fp:
+				if fp.read(_INDEX_HEADER.size) == header:
+					offsets = array('q')
+					offsets.frombytes(fp.read())
+					if sys.byteorder != "little":  # pragma: no cover
+						offsets.byteswap()
+					return offsets
+
+		offsets = _index_lines(self._data)
+
+		if index_file is not None:
+			stored = array('q', offsets)
+			if sys.byteorder != "little":  # pragma: no cover
+				stored.byteswap()
+			with open(index_file, "wb") as fp:
+				fp.write(header)
+				fp.write(stored.tobytes())
+
+		return offsets
+
+	def _decode(self, offset: int) -> _C:
+		end = self._data.find(b"\n", offset)
+		return self._from_json(self._data[offset:] if end < 0 else self._data[offset:end])
+
+	@overload
+	def __getitem__(self, index: int) -> _C: ...
+
+	@overload
+	def __getitem__(self, index: slice) -> List[_C]: ...
+
+	def __getitem__(self, index: Union[int, slice]) -> Union[_C, List[_C]]:
+		if isinstance(index, slice):
+			return [self[i] for i in range(*index.indices(len(self._offsets)))]
+
+		if index < 0:
+			index += len(self._offsets)
+		if not 0 <= index < len(self._offsets):
+			raise IndexError("RecordFile index out of range")
+
+		cache = self._cache
+		try:
+			obj = cache[index]
+		except KeyError:
+			obj = cache[index] = self._decode(self._offsets[index])
+			if len(cache) > self.cache_size:
+				cache.popitem(last=False)
+		else:
+			cache.move_to_end(index)
+
+		return obj
+
+	def __len__(self) -> int:
+		return len(self._offsets)
+
+	def __iter__(self) -> Iterator[_C]:
+		# Reading every record would only evict the cached instances.
+		return map(self._decode, self._offsets)
+
+	def close(self) -> None:
+		"""
+		Close the file, and discard the cached instances.
+		"""
+
+		self._cache.clear()
+		if isinstance(self._data, mmap.mmap):
+			self._data.close()
+		self._file.close()
+
+	def __enter__(self) -> "RecordFile[_C]":
+		return self
+
+	def __exit__(self, *args: Any) -> None:
+		self.close()
+
+	def __repr__(self) -> str:
+		return f"<{type(self).__name__}({self.cls.__qualname__}, {os.fspath(self.filename)!r}) with {len(self)} records>"
+
+
+def _decode_jsonl_item(from_dict: Callable[[Mapping[str, Any]], _C], item: Any) -> Optional[_C]:
+	"""
+	Construct an object from a dictionary, or from a line of JSON. Returns :py:obj:`None` for blank lines.
+
+	:param from_dict:
+	:param item:
+	"""
+
+	if isinstance(item, Mapping):
+		return from_dict(item)
+	elif item.strip():
+		return from_dict(json.loads(item))
+	else:
+		return None
+
+
+def _decode_jsonl_batch(from_dict: Callable[[Mapping[str, Any]], _C], items: List[Any]) -> List[_C]:
+	objs = []
+	for item in items:
+		obj = _decode_jsonl_item(from_dict, item)
+		if obj is not None:
+			objs.append(obj)
+	return objs
+
+
+async def aload_jsonl(
+		cls: Type[_C],
+		source: AsyncIterable[Any],
+		*,
+		batch_size: int = 100,
+		executor: Optional[Executor] = None,
+		) -> AsyncIterator[_C]:
+	"""
+	Asynchronously construct instances of a :deco:`~.serde` class from
+	an :class:`asyncio.StreamReader` containing `JSON Lines <https://jsonlines.org/>`_,
+	or any other asynchronous iterable of lines or dictionaries.
+
+	.. code-block:: python
+
+		async for device in aload_jsonl(Device, reader):
+			...
+
+	Control is returned to the event loop after every ``batch_size`` records,
+	so decoding a large amount of data does not block other tasks.
+
+	:param cls: The :deco:`~.serde` class.
+	:param source: An asynchronous iterable of :class:`str` or :class:`bytes` lines of JSON,
+		or of dictionaries. Blank lines are ignored.
+	:param batch_size: The number of records to decode before returning control to the event loop.
+	:param executor: If given, each batch of ``batch_size`` records is decoded in this executor
+		(such as a :class:`~concurrent.futures.ThreadPoolExecutor`) rather than in the event loop's thread.
+
+	.. versionadded:: 1.2.0
+	"""
+
+	from_dict = _get_plan(cls).from_dict
+
+	if executor is None:
+		count = 0
+		async for item in source:
+			obj = _decode_jsonl_item(from_dict, item)
+			if obj is None:
+				continue
+
+			yield obj
+
+			count += 1
+			if count >= batch_size:
+				count = 0
+				await asyncio.sleep(0)
+
+		return
+
+	loop = asyncio.get_running_loop()
+	batch: List[Any] = []
+
+	async for item in source:
+		batch.append(item)
+
+		if len(batch) >= batch_size:
+			for obj in await loop.run_in_executor(executor, _decode_jsonl_batch, from_dict, batch):
+				yield obj
+			batch = []
+
+	if batch:
+		for obj in await loop.run_in_executor(executor, _decode_jsonl_batch, from_dict, batch):
+			yield obj
+
+
+def _encode_jsonl_batch(objs: List[Any], convert_values: bool, encode: Callable[[Any], str]) -> bytes:
+	"""
+	Returns the JSON Lines encoding of the given :deco:`~.serde` class instances.
+
+	:param objs:
+	:param convert_values: Passed to each object's ``to_dict`` method.
+	:param encode: Function to encode a dictionary as JSON.
+	"""
+
+	lines = []
+	obj_type, to_dict = None, None
+
+	for obj in objs:
+		if type(obj) is not obj_type:
+			obj_type = type(obj)
+			plan = _get_plan(obj_type)
+			to_dict = plan.to_dict_converted if convert_values else plan.to_dict
+
+		lines.append(encode(to_dict(obj)))  # type: ignore[misc]
+		lines.append('\n')
+
+	return ''.join(lines).encode("UTF-8")
+
+
+async def adump_jsonl(
+		objs: Union[Iterable[AttrsClass], AsyncIterable[AttrsClass]],
+		writer: asyncio.StreamWriter,
+		*,
+		convert_values: bool = False,
+		batch_size: int = 1000,
+		default: Optional[Callable[[Any], Any]] = None,
+		executor: Optional[Executor] = None,
+		) -> int:
+	"""
+	Asynchronously write instances of :deco:`~.serde` classes to an :class:`asyncio.StreamWriter`
+	as `JSON Lines <https://jsonlines.org/>`_.
+
+	The objects are encoded and written in batches of ``batch_size`` records,
+	waiting for the writer to :meth:`~asyncio.StreamWriter.drain` after each batch,
+	which also returns control to the event loop.
+
+	:param objs: The objects to write. This may be an iterable or an asynchronous iterable.
+	:param writer: The stream to write to.
+	:param convert_values: Passed to each object's ``to_dict`` method.
+	:param batch_size: The number of records to write at once.
+	:param default: Function called to serialise objects which are not natively supported by :mod:`json`.
+	:param executor: If given, each batch is encoded in this executor
+		(such as a :class:`~concurrent.futures.ThreadPoolExecutor`) rather than in the event loop's thread.
+
+	:returns: The number of records written.
+
+	.. versionadded:: 1.2.0
+	"""
+
+	encode = json.JSONEncoder(separators=(',', ':'), default=default).encode
+	loop = asyncio.get_running_loop()
+	count = 0
+	batch: List[Any] = []
+
+	async def write_batch() -> None:
+		if executor is None:
+			data = _encode_jsonl_batch(batch, convert_values, encode)
+		else:
+			data = await loop.run_in_executor(executor, _encode_jsonl_batch, batch, convert_values, encode)
+
+		writer.write(data)
+		await writer.drain()
+
+	if isinstance(objs, collections.abc.AsyncIterable):
+		async for obj in objs:
+			batch.append(obj)
+			if len(batch) >= batch_size:
+				await write_batch()
+				count += len(batch)
+				batch = []
+	else:
+		for obj in objs:
+			batch.append(obj)
+			if len(batch) >= batch_size:
+				await write_batch()
+				count += len(batch)
+				batch = []
+
+	if batch:
+		await write_batch()
+		count += len(batch)
+
+	return count
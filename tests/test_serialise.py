@@ -1,19 +1,58 @@
 import __future__
 
 # stdlib
+import asyncio
+import copy
+import gc
+import gzip
+import io
+import json
+import linecache
+import pathlib
+import pickle
+import re
+import weakref
 from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from enum import IntEnum
-from typing import Any, Dict, Mapping, MutableMapping, get_type_hints, no_type_check
+from typing import (
+		Any,
+		Dict,
+		FrozenSet,
+		Iterable,
+		List,
+		Mapping,
+		MutableMapping,
+		Optional,
+		Sequence,
+		Tuple,
+		Union,
+		get_type_hints,
+		no_type_check
+		)
 
 # 3rd party
 import attrs
+import pytest
 import sdjson
 from coincidence import PEP_563
 from sdjson import register_encoder
 from typing_extensions import Literal, Protocol, runtime_checkable
 
 # this package
-from attr_utils.serialise import serde
+from attr_utils.serialise import (
+		RecordFile,
+		SerdeMapping,
+		adump_jsonl,
+		aload_jsonl,
+		dump_jsonl,
+		json_default,
+		load_jsonl,
+		load_jsonl_parallel,
+		serde,
+		set_json_backend
+		)
+from attr_utils.serialise import _plans  # pylint: disable=protected-access
 
 
 class DeviceType(IntEnum):
@@ -187,6 +226,8 @@ def test_dunders():
 	from_dict_annotations = {'d': Mapping[str, Any]}
 	to_dict_annotations = {
 			"convert_values": bool,
+			"include": Optional[Iterable[Union[str, Sequence[Any]]]],
+			"exclude": Optional[Iterable[Union[str, Sequence[Any]]]],
 			"return": MutableMapping[str, Any],
 			}
 
@@ -194,6 +235,8 @@ def test_dunders():
 		from_dict_annotations_pep563 = {'d': "Mapping[str, Any]"}
 		to_dict_annotations_pep563 = {
 				"convert_values": "bool",
+				"include": "Optional[Iterable[Union[str, Sequence[Any]]]]",
+				"exclude": "Optional[Iterable[Union[str, Sequence[Any]]]]",
 				"return": "MutableMapping[str, Any]",
 				}
 	else:
@@ -270,3 +313,1199 @@ def test_sdjson():
 	assert loaded_device.display_name == d.display_name
 	assert loaded_device.configuration["make"] == d.configuration["make"]
 	assert loaded_device.configuration["smart"] == d.configuration["smart"]
+
+
+@serde
+@attrs.define
+class Defaults:
+	name: str = attrs.field(metadata={"from": ["info", "name"], "to": ["info", "name"]})
+	_tags: MutableMapping[str, Any] = attrs.field(factory=dict, metadata={"to": ["tags"]})
+	size: int = attrs.field(default=10, metadata={"to": ["info", "size"]})
+	label: str = attrs.field(
+			default=attrs.Factory(lambda self: self.name.upper(), takes_self=True),
+			metadata={"to": ["label"]},
+			)
+	cached: int = attrs.field(init=False, default=0)
+
+
+def test_from_dict_defaults():
+	obj = Defaults.from_dict({"info": {"name": "widget"}})
+	assert obj == Defaults("widget")
+	assert obj.label == "WIDGET"
+	assert obj._tags == {}
+	assert obj.size == 10
+
+	obj = Defaults.from_dict({"info": {"name": "widget"}, "_tags": {"a": 1}, "size": 5, "label": "Widget"})
+	assert obj == Defaults("widget", {'a': 1}, 5, "Widget")
+
+	# intermediate values which aren't dictionaries are treated as missing.
+	assert Defaults.from_dict({"info": {"name": "widget", "size": 5}}).size == 10
+	assert Defaults.from_dict({"info": "widget", "label": "Widget"}).name is attrs.NOTHING
+
+
+def test_to_dict_paths():
+	obj = Defaults("widget", {'a': 1}, 5)
+	assert obj.to_dict() == {"info": {"name": "widget", "size": 5}, "tags": {'a': 1}, "label": "WIDGET"}
+
+
+def test_to_dict_shared_prefixes():
+
+	@serde
+	@attrs.define
+	class Wide:
+		a: int = attrs.field(metadata={"to": ["x", "y", 'a']})
+		b: int = attrs.field(metadata={"to": ["x", 'b']})
+		c: int = attrs.field(metadata={"to": ["x", "y", 'c']})
+		d: int = attrs.field(metadata={"to": ['z']})
+		e: int = attrs.field(metadata={"to": ['z', 'e']})
+
+	assert Wide(1, 2, 3, 4, 5).to_dict() == {'x': {'y': {'a': 1, 'c': 3}, 'b': 2}, 'z': {'e': 5}}
+	assert list(Wide(1, 2, 3, 4, 5).to_dict()['x']) == ['y', 'b']
+
+
+def test_string_paths():
+
+	@serde
+	@attrs.define
+	class Order:
+		name: str = attrs.field(metadata={"from": "contact.personal.name", "to": "contact.name"})
+		first_id: int = attrs.field(metadata={"from": "items[0].id", "to": "items[0]"})
+		second_id: int = attrs.field(metadata={"from": "items[1].id", "to": "items[2]"})
+		count: int = attrs.field(default=0, metadata={"from": "counts[0][1]", "to": ["count"]})
+
+	d = {"contact": {"personal": {"name": "Alice"}}, "items": [{"id": 1}, {"id": 2}], "counts": [[7, 8]]}
+	order = Order.from_dict(d)
+	assert order == Order("Alice", 1, 2, 8)
+	assert Order.from_dict({"contact": {"personal": {"name": "Bob"}}, "items": [{"id": 1}]}).second_id is attrs.NOTHING
+
+	assert order.to_dict() == {"contact": {"name": "Alice"}, "items": [1, None, 2], "count": 8}
+	assert order.to_dict(include=[("items", 2)]) == {"items": [None, None, 2]}
+	assert dict(order.as_mapping())["items"] == [1, None, 2]
+	assert order.update_from_dict({"items": [{"id": 5}]}).first_id == 5
+
+	# A list index and an equal dictionary key would be output at the same position.
+	for other_path in (["items", 0], ["items", 0, "id"]):
+		with pytest.raises(
+				ValueError,
+				match=re.escape(
+						"The paths of the 'first_id' and 'other' fields collide, "
+						"as the list index [0] and the key 0 are the same position."
+						),
+				):
+
+			@serde
+			@attrs.define
+			class Colliding:
+				first_id: int = attrs.field(metadata={"to": "items[0]"})
+				other: int = attrs.field(metadata={"to": other_path})
+
+	for path in ('', "a..b", "a[0", "a[x]", "a]", ".a"):
+		with pytest.raises(ValueError, match=re.escape(f"Invalid path {path!r} for the 'name' field.")):
+
+			@serde
+			@attrs.define
+			class Invalid:
+				name: str = attrs.field(metadata={"from": path})
+
+
+def test_to_dict_projection():
+
+	@serde
+	@attrs.define
+	class Wide:
+		a: int = attrs.field(metadata={"to": ["x", "y", 'a']})
+		b: int = attrs.field(metadata={"to": ["x", 'b']})
+		c: int = attrs.field(metadata={"to": ["x", "y", 'c']})
+		d: int = attrs.field(metadata={"to": ['z']})
+
+	wide = Wide(1, 2, 3, 4)
+
+	assert wide.to_dict(include=['a', 'd']) == {'x': {'y': {'a': 1}}, 'z': 4}
+	assert wide.to_dict(include=[('x', 'y')]) == {'x': {'y': {'a': 1, 'c': 3}}}
+	assert wide.to_dict(include='x', exclude=['c']) == {'x': {'y': {'a': 1}, 'b': 2}}
+	assert wide.to_dict(exclude=[['x', 'y']]) == {'x': {'b': 2}, 'z': 4}
+	assert wide.to_dict(include=[]) == {}
+	assert wide.to_dict(include=['a', 'b', 'c', 'd']) == wide.to_dict()
+
+	# Compiled once per projection, and shared between selectors for the same fields.
+	assert wide.to_dict(include=['a', 'd']) == {'x': {'y': {'a': 1}}, 'z': 4}
+	assert _plans[Wide].projection(['d', 'a'], None) is _plans[Wide].projection(['a', 'z'], None)
+	assert _plans[Wide].projection(None, ['b'], True) is not _plans[Wide].projection(None, ['b'])
+
+	# Each function's source is registered with linecache under its own name, for tracebacks.
+	to_dict = _plans[Wide].to_dict
+	projection = _plans[Wide].projection(['a', 'd'], None)
+	assert projection.__name__.startswith("to_dict_projection")
+	assert projection.__code__.co_filename != to_dict.__code__.co_filename
+	assert linecache.getline(to_dict.__code__.co_filename, 1) == "def to_dict(self):\n"
+
+	with pytest.raises(ValueError, match="'w' does not match any field of"):
+		wide.to_dict(include=['w'])
+
+	assert Device(1000, "Television", DeviceType.RC).to_dict(True, exclude=["configuration"]) == {
+			"device_id": 1000,
+			"display_name": "Television",
+			"device_type": 1,
+			}
+
+
+def test_bulk():
+	dicts = [
+			{"device_id": 1000, "display_name": "Television", "device_type": 1},
+			{"device_id": "1001", "display_name": "Radio", "device_type": 2},
+			]
+
+	devices = Device.from_dicts(dicts)
+	assert devices == [
+			Device(1000, "Television", DeviceType.RC),
+			Device(1001, "Radio", DeviceType.SCIC),
+			]
+	assert Device.from_dicts(iter(dicts)) == devices
+
+	lazy = Device.iter_from_dicts(d for d in dicts)
+	assert not isinstance(lazy, list)
+	assert list(lazy) == devices
+
+	expected = [{**d, "configuration": {}} for d in (d.to_dict() for d in devices)]
+	assert Device.to_dicts(devices) == expected
+	assert list(Device.iter_to_dicts(iter(devices))) == expected
+	assert Device.to_dicts(devices, convert_values=True) == [d.to_dict(convert_values=True) for d in devices]
+
+	assert EnhancedDevice.from_dicts(dicts) == [
+			EnhancedDevice(1000, "Television", DeviceType.RC),
+			EnhancedDevice(1001, "Radio", DeviceType.SCIC),
+			]
+
+
+def test_from_dicts_workers():
+	dicts = [{"device_id": str(i), "display_name": f"Device {i}", "device_type": 1 + i % 2} for i in range(50)]
+	expected = Device.from_dicts(dicts)
+
+	assert Device.from_dicts(dicts, workers=3) == expected
+	assert Device.from_dicts(iter(dicts), workers=2, chunk_size=7) == expected
+	assert EnhancedDevice.from_dicts(dicts, workers=2) == EnhancedDevice.from_dicts(dicts)
+
+	# Plans are pickled by reference
+	plan = pickle.loads(pickle.dumps(_plans[Device]))
+	assert plan is _plans[Device]
+
+
+def test_plan_cache():
+
+	@serde
+	@attrs.define
+	class Point:
+		x: int = attrs.field(metadata={"to": "X"})
+		y: int = attrs.field(metadata={"to": "Y"})
+
+	@attrs.define
+	class LabelledPoint(Point):
+		pass
+
+	# A subclass which doesn't add fields extends its parent's plan.
+	assert LabelledPoint.from_dict({'x': 1, 'y': 2}) == LabelledPoint(1, 2)
+	assert _plans[LabelledPoint].parent is _plans[Point]
+	assert _plans[LabelledPoint].to_dict is _plans[Point].to_dict
+	assert LabelledPoint(1, 2).to_dict() == {'X': 1, 'Y': 2}
+
+	# A subclass which adds fields reuses the specs and decoders of the fields it inherits.
+	@attrs.define
+	class Point3D(Point):
+		z: int = attrs.field(default=0, metadata={"to": "Z"})
+
+	assert Point3D.from_dict({'x': 1, 'y': 2.0, 'z': "3"}) == Point3D(1, 2, 3)
+	assert _plans[Point3D].fields[:2] == _plans[Point].fields
+	assert _plans[Point3D].fields[0] is _plans[Point].fields[0]
+	assert _plans[Point3D].decoders['x'] is _plans[Point].decoders['x']
+	assert Point3D(1, 2, 3).to_dict() == {'X': 1, 'Y': 2, 'Z': 3}
+
+	# Decorating the parent again discards the plans derived from the old one.
+	serde(Point, to_key="output")
+	assert LabelledPoint not in _plans
+	assert LabelledPoint(1, 2).to_dict() == {'x': 1, 'y': 2}
+
+	# Plans don't keep their classes alive.
+	ref = weakref.ref(Point)
+	del Point, LabelledPoint, Point3D
+	gc.collect()
+	assert ref() is None
+
+
+class _UnseekableStream(io.RawIOBase):
+
+	def __init__(self, data: bytes):
+		self._data = io.BytesIO(data)
+
+	def readable(self) -> bool:
+		return True
+
+	def readinto(self, buffer: Any) -> int:
+		return self._data.readinto(buffer)
+
+
+@pytest.mark.parametrize("suffix", [".jsonl", ".jsonl.gz", ".jsonl.bz2", ".jsonl.xz"])
+def test_jsonl_file(tmp_path: pathlib.Path, suffix: str):
+	devices = [Device(1000 + i, f"Device {i}", DeviceType.RC, {"index": i}) for i in range(25)]
+	filename = tmp_path / f"devices{suffix}"
+
+	assert dump_jsonl(iter(devices), filename, batch_size=10) == 25
+	loaded = load_jsonl(Device, filename)
+	assert not isinstance(loaded, list)
+	assert list(loaded) == devices
+
+	with open(filename, "rb") as fp:
+		assert list(load_jsonl(Device, fp)) == devices
+
+	# the stream need not be seekable
+	with open(filename, "rb", buffering=0) as fp:
+		assert list(load_jsonl(Device, fp)) == devices
+
+	# nor buffered, and it is left open
+	raw = _UnseekableStream(filename.read_bytes())
+	assert list(load_jsonl(Device, raw)) == devices
+	assert not raw.closed
+
+
+def test_record_file(tmp_path: pathlib.Path):
+	devices = [Device(1000 + i, f"Device {i}", DeviceType.RC, {"index": i}) for i in range(25)]
+	filename = tmp_path / "devices.jsonl"
+	dump_jsonl(devices[:10], filename)
+	with open(filename, 'a', encoding="UTF-8") as fp:
+		fp.write("\n  \n")
+	with open(filename, 'ab') as fp:
+		dump_jsonl(devices[10:], fp)
+
+	with RecordFile(Device, filename, cache_size=2) as records:
+		assert len(records) == 25
+		assert records[0] == devices[0]
+		assert records[-1] == devices[-1]
+		assert records[12] == devices[12]
+		assert records[5:8] == devices[5:8]
+		assert list(records) == devices
+		assert "with 25 records" in repr(records)
+
+		# Recently used instances are cached
+		assert records[24] is records[24]
+		first = records[0]
+		records[1]
+		records[2]
+		assert records[0] is not first
+
+		with pytest.raises(IndexError, match="RecordFile index out of range"):
+			records[25]
+
+	# The index is rebuilt when the file changes.
+	index_file = tmp_path / "devices.idx"
+	with RecordFile(Device, filename, index_file=index_file) as records:
+		assert records[20] == devices[20]
+
+	with RecordFile(Device, filename, index_file=index_file) as records:
+		assert records[:] == devices
+
+	dump_jsonl(devices[:3], filename)
+	with RecordFile(Device, filename, index_file=index_file) as records:
+		assert records[:] == devices[:3]
+
+	filename.write_bytes(b'')
+	with RecordFile(Device, filename) as records:
+		assert len(records) == 0
+
+	dump_jsonl(devices, tmp_path / "devices.jsonl.gz")
+	with pytest.raises(ValueError, match="RecordFile cannot read gzip compressed files."):
+		RecordFile(Device, tmp_path / "devices.jsonl.gz")
+
+
+@pytest.mark.parametrize("workers", [1, 3])
+def test_load_jsonl_parallel(tmp_path: pathlib.Path, workers: int):
+	devices = [Device(1000 + i, f"Device {i}", DeviceType.RC, {"index": i}) for i in range(200)]
+	filename = tmp_path / "devices.jsonl"
+	dump_jsonl(devices[:100], filename)
+	with open(filename, 'a', encoding="UTF-8") as fp:
+		fp.write("\n  \n")
+	with open(filename, 'ab') as fp:
+		dump_jsonl(devices[100:], fp)
+
+	assert list(load_jsonl_parallel(Device, filename, workers=workers, chunk_size=1000)) == devices
+	assert list(load_jsonl_parallel(Device, filename, workers=workers)) == devices
+
+	unordered = list(load_jsonl_parallel(Device, filename, workers=workers, chunk_size=500, ordered=False))
+	assert sorted(unordered, key=lambda d: d.device_id) == devices
+
+	# Stopping early
+	assert next(iter(load_jsonl_parallel(Device, filename, workers=workers, chunk_size=500))) == devices[0]
+
+	filename.write_bytes(b'')
+	assert list(load_jsonl_parallel(Device, filename, workers=workers)) == []
+
+	dump_jsonl(devices, tmp_path / "devices.jsonl.xz")
+	with pytest.raises(ValueError, match="lzma compressed files cannot be split. Use 'load_jsonl' instead."):
+		load_jsonl_parallel(Device, tmp_path / "devices.jsonl.xz", workers=workers)
+
+
+def test_jsonl_streams():
+	devices = [Device(1000 + i, f"Device {i}", DeviceType.RC) for i in range(3)]
+
+	text = io.StringIO()
+	assert dump_jsonl(devices, text) == 3
+	assert text.getvalue().splitlines()[0] == (
+			'{"device_id":1000,"display_name":"Device 0","device_type":1,"configuration":{}}'
+			)
+	assert list(load_jsonl(Device, io.StringIO(text.getvalue() + "\n\n"))) == devices
+
+	binary = io.BytesIO()
+	assert dump_jsonl(devices, binary, compression="gzip") == 3
+	assert gzip.decompress(binary.getvalue()).decode("UTF-8") == text.getvalue()
+	binary.seek(0)
+	assert list(load_jsonl(Device, binary)) == devices
+
+	with pytest.raises(ValueError, match="Compression cannot be used with a file opened in text mode."):
+		dump_jsonl(devices, io.StringIO(), compression="gzip")
+
+	with pytest.raises(TypeError, match="'MagicMapping' is not a serde class."):
+		load_jsonl(MagicMapping, text)
+
+
+class _Writer:
+
+	def __init__(self):
+		self.chunks: List[bytes] = []
+		self.drained = 0
+
+	def write(self, data: bytes) -> None:
+		self.chunks.append(data)
+
+	async def drain(self) -> None:
+		self.drained += 1
+
+
+@pytest.mark.parametrize("executor", [False, True])
+def test_jsonl_async(executor: bool):
+	devices = [Device(1000 + i, f"Device {i}", DeviceType.RC) for i in range(25)]
+
+	async def lines():
+		for device in devices:
+			yield device.to_dict()
+			yield "\n"
+
+	async def generate():
+		for device in devices:
+			yield device
+
+	async def main(pool: Optional[ThreadPoolExecutor]) -> None:
+		writer = _Writer()
+		assert await adump_jsonl(generate(), writer, batch_size=10, executor=pool) == 25  # type: ignore[arg-type]
+		assert writer.drained == 3
+		assert len(writer.chunks) == 3
+
+		data = b''.join(writer.chunks)
+		assert data == b''.join(b"%s\n" % json.dumps(d.to_dict(), separators=(',', ':')).encode() for d in devices)
+
+		writer = _Writer()
+		assert await adump_jsonl(devices, writer, executor=pool) == 25  # type: ignore[arg-type]
+		assert b''.join(writer.chunks) == data
+
+		reader = asyncio.StreamReader()
+		reader.feed_data(data)
+		reader.feed_eof()
+		assert [d async for d in aload_jsonl(Device, reader, batch_size=10, executor=pool)] == devices
+
+		assert [d async for d in aload_jsonl(Device, lines(), batch_size=7, executor=pool)] == devices
+
+	if executor:
+		with ThreadPoolExecutor(2) as pool:
+			asyncio.run(main(pool))
+	else:
+		asyncio.run(main(None))
+
+
+def test_columns():
+	devices = [
+			Device(1000, "Television", DeviceType.RC, {"make": "Samsung"}),
+			Device(1001, "Radio", DeviceType.SCIC),
+			]
+
+	columns = Device.to_columns(iter(devices))
+	assert columns == {
+			("device_id", ): [1000, 1001],
+			("display_name", ): ["Television", "Radio"],
+			("device_type", ): [DeviceType.RC, DeviceType.SCIC],
+			("configuration", ): [{"make": "Samsung"}, {}],
+			}
+	assert Device.from_columns(columns) == devices
+
+	devices = Device.from_columns({
+			("device_id", ): ["1000", "1001"],
+			("display_name", ): ["Television", "Radio"],
+			("device_type", ): [1, 2],
+			})
+	assert devices == [Device(1000, "Television", DeviceType.RC), Device(1001, "Radio", DeviceType.SCIC)]
+	assert devices[0].configuration is not devices[1].configuration
+	assert type(devices[0]) is Device
+
+	with pytest.raises(ValueError, match="All columns must be the same length."):
+		Device.from_columns({("device_id", ): [1000], ("display_name", ): []})
+
+	assert Device.from_columns({}) == []
+
+	with pytest.raises(ValueError, match=r"\('id',\) is not the 'from' path of any field of 'Device'."):
+		Device.from_columns({("device_id", ): [1000], ("id", ): [1000]})
+
+
+def test_columns_defaults():
+	objs = [Defaults("widget", size=5), Defaults("gadget", {'a': 1}, label="g")]
+	columns = Defaults.to_columns(objs)
+	assert columns == {
+			("info", "name"): ["widget", "gadget"],
+			("info", "size"): [5, 10],
+			("tags", ): [{}, {'a': 1}],
+			("label", ): ["WIDGET", 'g'],
+			}
+
+	assert Defaults.from_columns({("info", "name"): ["widget", "gadget"]}) == [
+			Defaults("widget"),
+			Defaults("gadget"),
+			]
+
+	# The "from" path of size differs from its "to" path, so the output of to_columns isn't accepted.
+	with pytest.raises(ValueError, match=r"\('info', 'size'\) is not the 'from' path of any field of 'Defaults'."):
+		Defaults.from_columns(columns)
+
+
+def test_columns_validators_and_post_init():
+	calls = []
+
+	@serde
+	@attrs.define(frozen=True)
+	class Validated:
+		value: int = attrs.field(converter=int, validator=attrs.validators.instance_of(int))
+		doubled: int = attrs.field(init=False)
+
+		def __attrs_post_init__(self) -> None:
+			calls.append(self.value)
+			object.__setattr__(self, "doubled", self.value * 2)
+
+	objs = Validated.from_columns({("value", ): ['1', 2]})
+	assert objs == [Validated(1), Validated(2)]
+	assert objs[1].doubled == 4
+	assert calls == [1, 2, 1, 2]
+
+	@serde
+	@attrs.define
+	class Invalid:
+		value: str = attrs.field(validator=attrs.validators.instance_of(str))
+
+	with pytest.raises(TypeError, match="'value' must be <class 'str'>"):
+		Invalid.from_columns({("value", ): [1]})
+
+
+@serde
+@attrs.define(frozen=True)
+class Telemetry:
+	sensor: str = attrs.field(metadata={"dtype": "U8"})
+	reading: float = attrs.field(converter=float)
+	count: int = attrs.field()
+	device_type: DeviceType = attrs.field(converter=DeviceType)
+	ok: bool = attrs.field(default=True)
+
+
+def test_records():
+	numpy = pytest.importorskip("numpy")
+
+	readings = [Telemetry("temp", 21.5, 3, DeviceType.RC), Telemetry("humidity", 40, 7, DeviceType.SCIC, False)]
+
+	array = Telemetry.to_records(iter(readings))
+	assert array.dtype == numpy.dtype([
+			("sensor", "U8"),
+			("reading", "f8"),
+			("count", "i8"),
+			("device_type", "i8"),
+			("ok", '?'),
+			])
+	assert array["reading"].tolist() == [21.5, 40.0]
+	assert array["device_type"].tolist() == [1, 2]
+
+	loaded = Telemetry.from_records(array)
+	assert loaded == readings
+	assert type(loaded[0].count) is int
+	assert loaded[1].device_type is DeviceType.SCIC
+
+	partial = array[["sensor", "reading", "count", "device_type"]]
+	assert Telemetry.from_records(partial)[1].ok is True
+
+	with pytest.raises(TypeError, match="Cannot determine the NumPy dtype for the field 'display_name' of 'Device'"):
+		Device.to_records([])
+
+
+@serde
+@attrs.define
+class Channel:
+	number: int = attrs.field(metadata={"to": ["id", "number"], "from": ["id", "number"]})
+	name: str = attrs.field(default='')
+
+
+@serde
+@attrs.define
+class AcqMethod:
+	devices: List[Device] = attrs.field(factory=list)
+	channels: Dict[str, Channel] = attrs.field(factory=dict)
+	primary: Optional[Channel] = attrs.field(default=None)
+	history: Tuple[Channel, ...] = attrs.field(default=())
+	parent: Optional["AcqMethod"] = attrs.field(default=None)
+	sequence: Optional["Sequence_"] = attrs.field(default=None)
+
+
+@serde
+@attrs.define
+class Sequence_:
+	methods: List[AcqMethod] = attrs.field(factory=list)
+
+
+def test_nested():
+	method = AcqMethod(
+			devices=[Device(1000, "Television", DeviceType.RC)],
+			channels={'a': Channel(1, "one")},
+			primary=Channel(2),
+			history=(Channel(3), ),
+			parent=AcqMethod(),
+			sequence=Sequence_([AcqMethod(primary=Channel(4))]),
+			)
+
+	expected = {
+			"devices": [{"device_id": 1000, "display_name": "Television", "device_type": 1, "configuration": {}}],
+			"channels": {'a': {"id": {"number": 1}}},
+			"primary": {"id": {"number": 2}},
+			"history": [{"id": {"number": 3}}],
+			"parent": {
+					"devices": [],
+					"channels": {},
+					"primary": None,
+					"history": [],
+					"parent": None,
+					"sequence": None,
+					},
+			"sequence": {
+					"methods": [{
+							"devices": [],
+							"channels": {},
+							"primary": {"id": {"number": 4}},
+							"history": [],
+							"parent": None,
+							"sequence": None,
+							}],
+					},
+			}
+
+	as_dict = method.to_dict(convert_values=True)
+	assert as_dict == expected
+	assert method.to_dict()["primary"] is method.primary
+
+	expected["channels"]['a']["name"] = "one"
+	loaded = AcqMethod.from_dict(expected)
+	assert loaded == method
+	assert isinstance(loaded.sequence.methods[0].primary, Channel)  # type: ignore[union-attr]
+
+	# Instances are left as they are
+	assert AcqMethod.from_dict({"primary": Channel(5)}).primary == Channel(5)
+
+
+@serde
+@attrs.define
+class Connection:
+	device_type: DeviceType
+	ports: List[Port]
+	port_counts: Dict[Port, int]
+	weights: Tuple[float, ...] = ()
+	backup: Optional[DeviceType] = None
+	pair: Tuple[Port, str] = (Port.HDMI, '')
+	unique: FrozenSet[Port] = frozenset()
+	label: str = ''
+	scale: float = attrs.field(default=1.0, converter=lambda x: float(x) * 2)
+
+
+def test_type_directed_decoding():
+	connection = Connection.from_dict({
+			"device_type": 1,
+			"ports": [1, 2],
+			"port_counts": {"1": "3", 4: 1},
+			"weights": [1, 2.5],
+			"backup": 2,
+			"pair": [3, "x"],
+			"unique": [5, 5],
+			"label": "TV",
+			"scale": "2",
+			})
+
+	assert connection == Connection(
+			DeviceType.RC,
+			[Port.HDMI, Port.VGA],
+			{Port.HDMI: 3, Port.DP: 1},
+			(1.0, 2.5),
+			DeviceType.SCIC,
+			(Port.DVI, 'x'),
+			frozenset({Port.SCART}),
+			"TV",
+			2.0,
+			)
+	assert connection.device_type is DeviceType.RC
+	assert connection.ports[0] is Port.HDMI
+	assert type(connection.weights[0]) is float
+	# The converter is only applied once
+	assert connection.scale == 4.0
+
+	connection = Connection.from_dict({"device_type": DeviceType.SCIC, "ports": [], "port_counts": {}, "backup": None})
+	assert connection.device_type is DeviceType.SCIC
+	assert connection.backup is None
+
+	with pytest.raises(ValueError, match="Cannot decode 3 as DeviceType for field 'device_type' without loss."):
+		Connection.from_dict({"device_type": 3, "ports": [], "port_counts": {}})
+
+
+@serde
+@attrs.define
+class Measurement:
+	count: int
+	value: Optional[float] = None
+	samples: List[int] = attrs.Factory(list)
+
+
+def test_scalar_decoding_is_strict():
+	assert Measurement.from_dict({"count": 2.0, "value": 3}) == Measurement(2, 3.0)
+	assert type(Measurement.from_dict({"count": 2.0}).count) is int
+	assert Measurement.from_dict({"count": "3", "value": "1.5", "samples": ["4", 5.0]}) == Measurement(3, 1.5, [4, 5])
+
+	# None is left for the validators rather than raising TypeError
+	assert Measurement.from_dict({"count": None, "value": None}) == Measurement(None, None)  # type: ignore[arg-type]
+
+	with pytest.raises(ValueError, match="Cannot decode 1.7 as int for field 'count' without loss."):
+		Measurement.from_dict({"count": 1.7})
+
+	with pytest.raises(ValueError, match="Cannot decode 'many' as int for field 'count' without loss."):
+		Measurement.from_dict({"count": "many"})
+
+	with pytest.raises(ValueError, match=r"Cannot decode \[1\] as float for field 'value' without loss."):
+		Measurement.from_dict({"count": 1, "value": [1]})
+
+	with pytest.raises(ValueError, match="Cannot decode 0.5 as int for field 'samples' without loss."):
+		Measurement.from_dict({"count": 1, "samples": [1, 0.5]})
+
+	with pytest.raises(ValueError, match="Cannot decode 10+ as float for field 'value' without loss."):
+		Measurement.from_dict({"count": 1, "value": 10**400})
+
+	with pytest.raises(ValueError, match="Cannot decode inf as int for field 'count' without loss."):
+		Measurement.from_dict({"count": float("inf")})
+
+
+def test_scalar_decoding_subclasses():
+	# Subclasses of int and float are accepted, and normalised to the built-in type.
+	measurement = Measurement.from_dict({"count": Port.DP, "value": DeviceType.RC, "samples": [True, False]})
+	assert measurement == Measurement(4, 1.0, [1, 0])
+	assert type(measurement.count) is int
+	assert type(measurement.value) is float
+	assert [type(sample) for sample in measurement.samples] == [int, int]
+
+	# so the output of to_dict can be read back
+	for original in (Measurement(Port.DP, 1.5, [DeviceType.SCIC]), Measurement(True, False, [True])):
+		assert Measurement.from_dict(original.to_dict()) == original
+		assert Measurement.from_dict(original.to_dict(convert_values=True)) == original
+
+
+def test_scalar_decoding_numpy():
+	numpy = pytest.importorskip("numpy")
+
+	measurement = Measurement.from_dict({
+			"count": numpy.int64(3),
+			"value": numpy.float64(1.5),
+			"samples": [numpy.int32(1), numpy.float32(2.0)],
+			})
+	assert measurement == Measurement(3, 1.5, [1, 2])
+	assert type(measurement.count) is int
+	assert type(measurement.value) is float
+	assert [type(sample) for sample in measurement.samples] == [int, int]
+	assert Measurement.from_dict({"count": 1, "value": numpy.float32(0.5)}).value == 0.5
+
+	original = Measurement(numpy.int64(7), numpy.float64(0.25), [numpy.int16(2)])  # type: ignore[arg-type]
+	assert Measurement.from_dict(original.to_dict()) == original
+
+	with pytest.raises(ValueError, match=r"Cannot decode .*2\.5\)? as int for field 'count' without loss."):
+		Measurement.from_dict({"count": numpy.float64(2.5)})
+
+
+@serde
+@attrs.frozen
+class Sensor:
+	number: int = attrs.field(metadata={"to": ["id", "number"], "from": ["id", "number"]})
+	name: str = attrs.field(default='', converter=str.upper, metadata={"to": ["name"]})
+
+
+def _make_reading(slots: bool) -> Any:
+
+	@serde
+	@attrs.frozen(cache_hash=True, slots=slots)
+	class Reading:
+		sensor: Sensor
+		value: float = attrs.field(converter=lambda x: float(x) * 2, validator=attrs.validators.ge(0))
+		unit: str = attrs.field(default=attrs.Factory(lambda self: f"ch{self.sensor.number}", takes_self=True))
+		tags: Tuple[str, ...] = attrs.field(default=(), converter=tuple)
+		checked: bool = attrs.field(init=False, default=False)
+
+		def __attrs_post_init__(self):
+			object.__setattr__(self, "checked", True)
+
+	return Reading
+
+
+@pytest.mark.parametrize("slots", [True, False])
+def test_from_dict_unchecked(slots: bool):
+	cls = _make_reading(slots)
+
+	reading = cls.from_dict_unchecked({"sensor": {"id": {"number": 3}, "name": "a"}, "value": 1.5})
+	assert type(reading) is cls
+	# Converters are not applied, including in nested classes, but defaults and __attrs_post_init__ are.
+	assert reading.sensor == Sensor.from_dict_unchecked({"id": {"number": 3}, "name": "a"})
+	assert reading.sensor.name == 'a'
+	assert reading.value == 1.5
+	assert reading.unit == "ch3"
+	assert reading.tags == ()
+	assert reading.checked
+	assert hash(reading) == hash(cls(reading.sensor, 0.75))
+	assert hash(reading) == hash(reading)
+
+	# Round trips
+	reading = cls(Sensor(1, "one"), 2, tags=['a'])
+	assert cls.from_dict_unchecked(reading.to_dict()) == reading
+	assert cls.from_dict_unchecked(reading.to_dict(convert_values=True)).sensor == reading.sensor
+
+	# Validators are not run
+	assert cls.from_dict_unchecked({"sensor": {"id": {"number": 1}}, "value": -1}).value == -1
+
+	with pytest.raises(attrs.exceptions.FrozenInstanceError):
+		reading.value = 5
+
+	assert hasattr(reading, "__dict__") is not slots
+
+
+def test_as_mapping():
+	obj = Defaults("widget", {'a': 1}, 5)
+	view = obj.as_mapping()
+
+	assert isinstance(view, SerdeMapping)
+	assert view == obj.to_dict()
+	assert list(view) == ["info", "tags", "label"]
+	assert len(view["info"]) == 2
+	assert view["info"]["size"] == 5
+	assert "label" in view
+	assert "size" not in view
+	assert view.get("size") is None
+	assert repr(view["info"]) == "SerdeMapping({'name': 'widget', 'size': 5})"
+
+	with pytest.raises(KeyError):
+		view["size"]  # pylint: disable=pointless-statement
+
+	# Values are read from the instance when accessed
+	obj.size = 6
+	assert view["info"]["size"] == 6
+
+	method = AcqMethod(channels={'a': Channel(1, "one")}, primary=Channel(2))
+	assert method.as_mapping()["primary"] is method.primary
+	assert json.loads(json.dumps(method.as_mapping(), default=json_default)) == method.to_dict(convert_values=True)
+
+	with pytest.raises(TypeError, match="Object of type object is not JSON serializable"):
+		json.dumps({'a': object()}, default=json_default)
+
+
+@pytest.mark.parametrize("slots", [True, False])
+def test_from_dict_lazy(slots: bool):
+	calls = Counter()
+
+	def to_float(value: Any) -> float:
+		calls[value] += 1
+		return float(value)
+
+	@serde
+	@attrs.define(slots=slots)
+	class Event:
+		kind: str = attrs.field(metadata={"from": ["meta", "kind"], "to": ["meta", "kind"]})
+		value: float = attrs.field(converter=to_float, validator=attrs.validators.ge(0), metadata={"to": ["value"]})
+		sensor: Optional[Sensor] = attrs.field(default=None, metadata={"to": ["sensor"]})
+		tags: List[str] = attrs.field(factory=list, metadata={"to": ["tags"]})
+
+	events = [Event.from_dict_lazy({"meta": {"kind": kind}, "value": idx}) for idx, kind in enumerate("abab")]
+	selected = [e for e in events if e.kind == 'a']
+	assert not calls
+
+	assert selected == [Event('a', 0), Event('a', 2)]
+	assert calls == {0: 2, 2: 2}
+
+	event = events[1]
+	assert isinstance(event, Event)
+	assert event.__class__ is Event
+	assert type(event) is not Event
+	assert event.value == 1.0
+	assert event.value == 1.0
+	assert calls[1] == 1
+	assert event.tags == []
+	assert event.tags is event.tags
+	assert event.to_dict() == {"meta": {"kind": 'b'}, "value": 1.0, "sensor": None, "tags": []}
+	assert event.as_mapping()["value"] == 1.0
+	assert repr(event) == "Event(kind='b', value=1.0, sensor=None, tags=[])"
+
+	event.value = 5
+	assert event.value == 5.0
+	assert event == Event('b', 5)
+
+	event = Event.from_dict_lazy({"meta": {"kind": 'c'}, "value": 3, "sensor": {"id": {"number": 1}}})
+	assert event.sensor == Sensor(1)
+	assert copy.copy(event) == Event('c', 3, Sensor(1))
+	assert type(copy.copy(event)) is Event
+	assert type(pickle.loads(pickle.dumps(Sensor.from_dict_lazy({"id": {"number": 4}})))) is Sensor
+	assert attrs.evolve(event, kind='d') == Event('d', 3, Sensor(1))
+
+	# Errors are raised when the field is first read
+	event = Event.from_dict_lazy({"meta": {"kind": 'c'}, "value": -1})
+	with pytest.raises(ValueError, match="'value' must be >= 0"):
+		event.value  # pylint: disable=pointless-statement
+
+
+def test_to_dict_delta():
+	previous = Defaults("widget", {'a': 1}, 5)
+	obj = attrs.evolve(previous, size=6)
+	assert obj.to_dict_delta(previous) == ({"info": {"size": 6}}, [])
+	assert obj.to_dict_delta(previous.to_dict()) == ({"info": {"size": 6}}, [])
+	assert obj.to_dict_delta(obj) == ({}, [])
+	assert obj.to_dict_delta(obj.to_dict()) == ({}, [])
+
+	obj = Defaults("gadget", {'a': 2}, 5, label="gadget")
+	assert obj.to_dict_delta(previous) == ({"info": {"name": "gadget"}, "tags": {'a': 2}, "label": "gadget"}, [])
+
+	# Missing and removed paths in snapshots
+	snapshot = {"info": {"name": "gadget", "colour": "red"}, "tags": {'a': 2}, "extra": 1}
+	assert obj.to_dict_delta(snapshot) == (
+			{"info": {"size": 5}, "label": "gadget"},
+			[("info", "colour"), ("extra", )],
+			)
+
+	# Nested serde classes
+	previous_method = AcqMethod(channels={'a': Channel(1, "one")}, history=(Channel(2), ))
+	method = attrs.evolve(previous_method, history=(Channel(2), Channel(3)))
+	assert method.to_dict_delta(previous_method) == ({"history": (Channel(2), Channel(3))}, [])
+	changed = {"history": [{"id": {"number": 2}}, {"id": {"number": 3}}]}
+	assert method.to_dict_delta(previous_method, convert_values=True) == (changed, [])
+	assert method.to_dict_delta(previous_method.to_dict(convert_values=True), convert_values=True) == (changed, [])
+
+	# Levels output as lists by to_dict are sparse dictionaries keyed by index.
+	@serde
+	@attrs.define
+	class Order:
+		first: int = attrs.field(metadata={"to": "items[0]"})
+		second: Optional[int] = attrs.field(default=None, metadata={"to": "items[1]"})
+
+	previous_order = Order(1, 2)
+	assert previous_order.to_dict() == {"items": [1, 2]}
+	for previous in (previous_order, previous_order.to_dict()):
+		changed, removed = Order(1, None).to_dict_delta(previous)
+		assert changed == {"items": {1: None}}
+		assert [type(key) for key in changed["items"]] == [int]
+		assert removed == []
+
+
+def test_update_from_dict():
+	calls = Counter()
+
+	def counted(converter: Any) -> Any:
+
+		def convert(value: Any) -> Any:
+			calls[converter.__name__] += 1
+			return converter(value)
+
+		return convert
+
+	@serde
+	@attrs.define
+	class Mutable:
+		name: str = attrs.field(converter=counted(str), metadata={"from": ["info", "name"]})
+		size: int = attrs.field(default=1, converter=counted(int), validator=attrs.validators.ge(0))
+		port: Port = attrs.field(default=Port.HDMI)
+
+	obj = Mutable("widget")
+	calls.clear()
+
+	assert obj.update_from_dict({"size": "5", "other": 1}) is obj
+	assert calls == {"int": 1}
+	assert obj == Mutable("widget", 5)
+
+	assert obj.update_from_dict({"info": {"name": "gadget"}, "port": 4}) is obj
+	assert obj == Mutable("gadget", 5, Port.DP)
+	assert obj.update_from_dict({}) is obj
+
+	with pytest.raises(ValueError, match="'size' must be >= 0"):
+		obj.update_from_dict({"size": -1})
+
+	# Classes without setattr hooks
+	@serde
+	@attrs.define(on_setattr=attrs.setters.NO_OP)
+	class Plain:
+		value: float = attrs.field(converter=counted(float), metadata={"from": ["reading", "value"]})
+
+	obj = Plain(1)
+	calls.clear()
+	assert obj.update_from_dict({"reading": {"value": "3"}}) is obj
+	assert obj.value == 3.0
+	assert calls == {"float": 1}
+
+	# Hooks which only validate, or only convert, and hooks set on individual fields.
+	@serde
+	@attrs.define(on_setattr=attrs.setters.validate)
+	class Partial:
+		value: float = attrs.field(converter=counted(float), validator=attrs.validators.ge(0))
+		count: int = attrs.field(
+				default=0,
+				converter=counted(int),
+				validator=attrs.validators.ge(0),
+				on_setattr=attrs.setters.convert,
+				)
+		label: str = attrs.field(default='', converter=counted(str), on_setattr=attrs.setters.NO_OP)
+
+	obj = Partial(1)
+	calls.clear()
+	assert obj.update_from_dict({"value": "3", "count": "4", "label": 5}) is obj
+	assert calls == {"float": 1, "int": 1, "str": 1}
+	assert obj == Partial(3.0, 4, '5')
+	assert type(obj.value) is float
+
+	with pytest.raises(ValueError, match="'value' must be >= 0"):
+		obj.update_from_dict({"value": "-1"})
+
+	with pytest.raises(ValueError, match="'count' must be >= 0"):
+		obj.update_from_dict({"count": "-1"})
+
+	# Converters run exactly once, whatever the class's hooks.
+	@serde
+	@attrs.define
+	class Doubled:
+		value: int = attrs.field(converter=lambda x: int(x) * 2)
+
+	assert Doubled(1).update_from_dict({"value": 3}).value == 6
+
+	# Fields with frozen or unknown hooks
+	@serde
+	@attrs.define
+	class Hooked:
+		name: str = attrs.field(default='')
+		locked: int = attrs.field(default=0, on_setattr=attrs.setters.frozen)
+		logged: int = attrs.field(default=0, on_setattr=lambda self, attribute, value: value)
+
+	obj = Hooked()
+	with pytest.raises(attrs.exceptions.FrozenAttributeError):
+		obj.update_from_dict({"name": "changed", "locked": 1})
+	assert obj == Hooked()
+
+	with pytest.raises(TypeError, match="Cannot update the 'logged' field of .*Hooked' as the effect of its on_setattr hook"):
+		obj.update_from_dict({"logged": 1})
+
+	assert _plans[Hooked].frozen is False
+	assert _plans[Mutable].frozen is False
+
+	# Frozen classes
+	assert _plans[Sensor].frozen is True
+	reading = _make_reading(slots=True)(Sensor(1), 2)
+	updated = reading.update_from_dict({"value": 5, "sensor": {"id": {"number": 2}}})
+	assert updated is not reading
+	assert updated.value == 10.0
+	assert updated.sensor == Sensor(2)
+	assert updated.unit == "ch1"
+	assert updated.checked
+	assert reading.value == 4.0
+
+	with pytest.raises(ValueError, match="'value' must be >= 0"):
+		reading.update_from_dict({"value": -1})
+
+
+@serde
+@attrs.define
+class Reading:
+	station: str = attrs.field(metadata={"intern": True, "from": ["Station Name"]})
+	unit: Optional[str] = attrs.field(default=None, metadata={"intern": 2})
+	note: str = ''
+
+
+def test_intern():
+	lines = [json.dumps({"Station Name": "Heathrow", "unit": unit, "note": "ok"}) for unit in ("mm", "cm", "in")]
+	readings = list(load_jsonl(Reading, io.StringIO('\n'.join(lines * 2))))
+
+	assert [r.unit for r in readings] == ["mm", "cm", "in", "mm", "cm", "in"]
+	assert all(r.station is readings[0].station for r in readings)
+	assert readings[0].unit is readings[3].unit
+	assert readings[1].unit is readings[4].unit
+
+	# The table is full, so further values aren't shared.
+	assert readings[2].unit is not readings[5].unit
+
+	# Fields without the metadata key are unchanged.
+	assert readings[0].note is not readings[3].note
+
+	# Also applies to the binary format.
+	assert Reading.from_bytes(readings[0].to_bytes()).station is readings[0].station
+	assert Reading.from_dict({"Station Name": "Gatwick"}).unit is None
+
+
+@serde
+@attrs.define
+class Blob:
+	key: str
+	size: int
+	port: Port
+	payload: bytes
+	sensor: Optional[Sensor] = None
+	ratio: Optional[float] = None
+	labels: Dict[str, Port] = attrs.field(factory=dict)
+	checked: bool = attrs.field(init=False, default=False)
+
+
+def test_bytes():
+	blob = Blob("ab€", 2**40, Port.DP, b"\x00\x01\x02", Sensor(3, "s"), 0.5, {'a': Port.VGA})
+	data = blob.to_bytes()
+	assert isinstance(data, bytes)
+	assert b"key" not in data
+
+	decoded = Blob.from_bytes(data)
+	assert decoded == blob
+	assert decoded.port is Port.DP
+	assert decoded.labels['a'] is Port.VGA
+	assert not decoded.checked
+
+	# bytes fields are slices of the input
+	assert isinstance(decoded.payload, memoryview)
+	assert decoded.payload.obj is data
+
+	blob = Blob('', -1, Port.HDMI, b'')
+	assert Blob.from_bytes(memoryview(blob.to_bytes())) == blob
+	assert Blob.from_bytes(bytearray(blob.to_bytes())).sensor is None
+
+	with pytest.raises(ValueError, match="The data was not encoded by Blob.to_bytes, or the class has changed since."):
+		Blob.from_bytes(Sensor(1).to_bytes() + bytes(64))
+
+	with pytest.raises(ValueError, match="Expected .* bytes of data, got .*"):
+		Blob.from_bytes(blob.to_bytes() + b'\x00')
+
+
+@serde
+@attrs.frozen
+class Tagged:
+	name: str
+	tags: FrozenSet[str] = attrs.field(converter=frozenset)
+	pair: Tuple[int, int] = attrs.field(converter=tuple)
+
+
+def test_bytes_converters():
+	tagged = Tagged("t", {'a', 'b'}, [1, 2])  # type: ignore[arg-type]
+	decoded = Tagged.from_bytes(tagged.to_bytes())
+
+	# Fields stored as JSON are passed through their converters, so the container types are kept.
+	assert decoded == tagged
+	assert hash(decoded) == hash(tagged)
+	assert type(decoded.tags) is frozenset
+	assert type(decoded.pair) is tuple
+
+
+@serde
+@attrs.define
+class Station:
+	name: str = attrs.field(metadata={"to": "info.name"})
+	sensors: List[Sensor] = attrs.field(factory=list, metadata={"to": "sensors"})
+	port: Port = attrs.field(default=Port.HDMI, metadata={"to": "ports[0]"})
+	ratio: Optional[float] = attrs.field(default=None, metadata={"to": "ports[2]"})
+	labels: Dict[int, FrozenSet[str]] = attrs.field(factory=dict, metadata={"to": "labels"})
+
+
+def test_to_json():
+	station = Station('Gare "du" Nord ✓', [Sensor(1, 'a'), Sensor(2, 'b')], Port.DP, 0.5, {3: frozenset({'x'})})
+	expected = json.dumps(station.to_dict(convert_values=True), separators=(',', ':'))
+
+	assert station.to_json() == expected
+	assert ''.join(station.iter_json()) == expected
+	assert Station('').to_json() == '{"info":{"name":""},"sensors":[],"ports":[1,null,null],"labels":{}}'
+
+	# Nested serde classes are encoded incrementally.
+	chunks = list(station.iter_json())
+	assert '{"id":{"number":1' in chunks
+	assert '{"id":{"number":2' in chunks
+
+	with pytest.raises(ValueError, match="Unknown JSON backend 'yaml'"):
+		set_json_backend("yaml")
+
+
+def test_to_json_orjson():
+	orjson = pytest.importorskip("orjson")
+
+	station = Station('Gare "du" Nord ✓', [Sensor(1, 'a'), Sensor(2, 'b')], Port.DP, 0.5, {3: frozenset({'x'})})
+	expected = json.dumps(station.to_dict(convert_values=True), separators=(',', ':'))
+
+	previous = set_json_backend("orjson")
+	try:
+		assert orjson.loads(station.to_json()) == orjson.loads(expected)
+	finally:
+		set_json_backend(previous)
+
+
+def test_from_json():
+	# The "from" and "to" paths of Sensor are the same, so the output of to_json can be read back.
+	text = '{"id": {"number": 3}, "name": "a"}'
+	assert Sensor.from_json(text) == Sensor(3, 'A')
+	assert Sensor.from_json(text.encode("UTF-8")) == Sensor(3, 'A')
+	assert Sensor.from_json(Sensor(4, 'b').to_json()) == Sensor(4, 'B')
+	assert Sensor.from_jsons(iter([text, b'{"id": {"number": 5}}'])) == [Sensor(3, 'A'), Sensor(5)]
+
+	with pytest.raises(json.JSONDecodeError):
+		Sensor.from_json('{"id": ')
+
+
+def test_from_json_orjson():
+	pytest.importorskip("orjson")
+
+	text = '{"id": {"number": 3}, "name": "a"}'
+
+	previous = set_json_backend("orjson")
+	try:
+		assert Sensor.from_json(text) == Sensor(3, 'A')
+		assert Sensor.from_jsons([text.encode("UTF-8")]) == [Sensor(3, 'A')]
+	finally:
+		set_json_backend(previous)
+
+
+@attrs.frozen(cache_hash=True)
+class DefaultPickleSensor:
+	number: int = attrs.field(converter=int, validator=attrs.validators.ge(0))
+	name: str = ''
+	history: Tuple[int, ...] = attrs.field(default=(), converter=tuple)
+	unit: str = attrs.field(init=False, default='V')
+	label: str = attrs.field(init=False)
+
+	def __attrs_post_init__(self):
+		object.__setattr__(self, "label", f"{self.name}{self.number}")
+
+
+@serde(compact_pickle=True)
+@attrs.frozen(cache_hash=True)
+class CompactSensor(DefaultPickleSensor):
+	pass
+
+
+def test_compact_pickle():
+	sensor = CompactSensor(1, "probe", [1, 2])
+	object.__setattr__(sensor, "unit", "mV")
+
+	for protocol in range(2, pickle.HIGHEST_PROTOCOL + 1):
+		restored = pickle.loads(pickle.dumps(sensor, protocol=protocol))
+		assert restored == sensor
+		assert type(restored) is CompactSensor
+		assert restored.unit == "mV"
+		assert restored.label == "probe1"
+		assert hash(restored) == hash(sensor)
+
+	assert copy.copy(sensor) == sensor
+	restored = pickle.loads(pickle.dumps(CompactSensor.from_dict_lazy({"number": 3})))
+	assert type(restored) is CompactSensor
+	assert restored.number == 3
+
+	# Smaller than the default
+	assert len(pickle.dumps(sensor)) < len(pickle.dumps(DefaultPickleSensor(1, "probe", [1, 2])))